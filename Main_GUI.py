@@ -1,5 +1,5 @@
 from typing import Iterable, List
-import sys, os, importlib
+import sys, os, importlib, multiprocessing
 from pathlib import Path
 
 from PyQt5 import QtCore, QtGui, QtWidgets
@@ -1939,4 +1939,5 @@ def main():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # ROI Save All spawns worker processes from the frozen exe
     main()
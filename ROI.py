@@ -1,4 +1,7 @@
-import sys, csv, time
+import os, sys, csv, time, threading, multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Tuple, Optional, Dict, Any
 
@@ -14,20 +17,70 @@ from PyQt5.QtWidgets import (
     QLineEdit, QScrollArea
 )
 
+# ---- Optional JIT for RANSAC inlier scoring ----
+try:
+    from numba import njit, prange, set_num_threads
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # ---------------- Processing helpers (unchanged) ----------------
 def imread_any(path: Path):
     img = cv2.imdecode(np.fromfile(str(path), dtype=np.uint8), cv2.IMREAD_COLOR)
     if img is None: raise IOError(f"Failed to read image: {path}")
     return img
 
-def preprocess(gray, clahe=True, blur_ksize=5):
+# Built once per process: CLAHE keeps its LUT state, blur kernels are cached per size
+_CLAHE = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+
+@lru_cache(maxsize=8)
+def _gauss_kernel(ksize: int):
+    return cv2.getGaussianKernel(ksize, 0)
+
+def preprocess(gray, clahe=True, blur_ksize=5, clahe_obj=None):
     if clahe:
-        cl = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        gray = cl.apply(gray)
+        gray = (clahe_obj or _CLAHE).apply(gray)
     if blur_ksize and blur_ksize > 1:
-        gray = cv2.GaussianBlur(gray, (blur_ksize, blur_ksize), 0)
+        k = _gauss_kernel(int(blur_ksize))
+        gray = cv2.sepFilter2D(gray, -1, k, k, borderType=cv2.BORDER_REFLECT_101)
     return gray
 
+class DecodeCache:
+    # LRU of decoded frames (and their preprocessed grays) keyed by (path, mtime_ns), bounded by
+    # item count and resident bytes; max_items=0 turns it into a pass-through
+    def __init__(self, max_items=8, max_bytes=512 * 1024 * 1024):
+        self.max_items = max_items; self.max_bytes = max_bytes
+        self._items: "OrderedDict[tuple, np.ndarray]" = OrderedDict(); self._bytes = 0
+
+    def _get(self, key) -> Optional[np.ndarray]:
+        arr = self._items.get(key)
+        if arr is not None: self._items.move_to_end(key)
+        return arr
+
+    def _put(self, key, arr: np.ndarray) -> np.ndarray:
+        arr.flags.writeable = False
+        if self.max_items <= 0: return arr
+        self._items[key] = arr; self._bytes += arr.nbytes
+        while len(self._items) > 1 and (len(self._items) > self.max_items or self._bytes > self.max_bytes):
+            _, old = self._items.popitem(last=False); self._bytes -= old.nbytes
+        return arr
+
+    def get_or_decode(self, path: Path, mtime_ns: Optional[int] = None) -> np.ndarray:
+        key = (path, path.stat().st_mtime_ns if mtime_ns is None else mtime_ns)
+        img = self._get(key)
+        return img if img is not None else self._put(key, imread_any(path))
+
+    def get_or_preprocess(self, path: Path, mtime_ns: Optional[int] = None):
+        # (bgr, proc); re-saving an unchanged image skips the decode and CLAHE + blur
+        key = (path, path.stat().st_mtime_ns if mtime_ns is None else mtime_ns)
+        bgr = self.get_or_decode(path, key[1]); proc = self._get(key + ("proc",))
+        if proc is None:
+            proc = preprocess(cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY), clahe=True, blur_ksize=5)
+            proc = self._put(key + ("proc",), proc)
+        return bgr, proc
+
+_DECODE_CACHE = DecodeCache()
+
 def pratt_fit(points_xy: np.ndarray):
     x = points_xy[:, 0]; y = points_xy[:, 1]
     x_mean, y_mean = x.mean(), y.mean()
@@ -35,39 +88,104 @@ def pratt_fit(points_xy: np.ndarray):
     Suu = np.sum(u*u); Suv = np.sum(u*v); Svv = np.sum(v*v)
     Suuu = np.sum(u*u*u); Svvv = np.sum(v*v*v)
     Suvv = np.sum(u*v*v); Svuu = np.sum(v*u*u)
-    A = np.array([[Suu, Suv], [Suv, Svv]], dtype=np.float64)
-    b = 0.5*np.array([Suuu + Suvv, Svvv + Svuu], dtype=np.float64)
+    A = np.array([[Suu, Suv], [Suv, Svv]], dtype=np.float32)
+    b = 0.5*np.array([Suuu + Suvv, Svvv + Svuu], dtype=np.float32)
     if np.linalg.det(A) < 1e-12: return None
     uc, vc = np.linalg.solve(A, b)
     cx = x_mean + uc; cy = y_mean + vc
     r = np.sqrt(uc*uc + vc*vc + (Suu + Svv)/len(points_xy))
     return float(cx), float(cy), float(r)
 
+def _triplet_circles(p1: np.ndarray, p2: np.ndarray, p3: np.ndarray):
+    # circumcircle of each (p1,p2,p3) row; same result as pratt_fit on 3 points, vectorized.
+    # Solved relative to p1 so float32 stays well-conditioned for large image coordinates.
+    bx, by = p2[:, 0]-p1[:, 0], p2[:, 1]-p1[:, 1]; qx, qy = p3[:, 0]-p1[:, 0], p3[:, 1]-p1[:, 1]
+    d = 2.0*(bx*qy - qx*by)
+    ok = np.abs(d) >= 4e-2  # twice-area / 4 >= 1e-2, i.e. skip near-collinear samples
+    d = np.where(ok, d, 1.0).astype(p1.dtype, copy=False)
+    b2 = bx*bx + by*by; q2 = qx*qx + qy*qy
+    ux = (qy*b2 - by*q2) / d; uy = (bx*q2 - qx*b2) / d
+    r = np.sqrt(ux*ux + uy*uy)
+    return (p1[:, 0]+ux)[ok], (p1[:, 1]+uy)[ok], r[ok]
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _score_inliers(xs, ys, cx, cy, r, thresh, counts):
+        # |dist - r| < thresh via squared distances; O(iters) memory, no sqrt
+        for k in prange(cx.size):
+            cxk = cx[k]; cyk = cy[k]; rk = r[k]
+            hi = (rk + thresh) * (rk + thresh)
+            lo = (rk - thresh) * (rk - thresh) if rk > thresh else -1.0
+            c = 0
+            for i in range(xs.size):
+                dx = xs[i] - cxk; dy = ys[i] - cyk; d2 = dx*dx + dy*dy
+                if d2 < hi and d2 > lo: c += 1
+            counts[k] = c
+else:
+    def _score_inliers(xs, ys, cx, cy, r, thresh, counts):
+        for k in range(cx.size):
+            d2 = (xs - cx[k])**2 + (ys - cy[k])**2
+            lo = (r[k] - thresh)**2 if r[k] > thresh else -1.0
+            counts[k] = np.count_nonzero((d2 < (r[k] + thresh)**2) & (d2 > lo))
+
+def ransac_budget(iters: int, n_points: int, min_inliers: int, confidence=0.999, floor=50) -> int:
+    # A valid fit has inlier ratio >= min_inliers/n_points, so this many 3-point draws hit an
+    # all-inlier sample with the given confidence; only ever lowers the user's iters.
+    w = min(1.0, min_inliers / max(1, n_points))
+    if w >= 1.0: return min(iters, floor)
+    need = int(np.ceil(np.log(1.0 - confidence) / np.log(1.0 - w**3)))
+    return int(min(iters, max(floor, need)))
+
 def ransac_circle(points_xy: np.ndarray, iters=800, thresh=2.0, min_inliers=60):
     if len(points_xy) < 20: return None, None
-    best = None; best_inliers = None; best_in = 0
     N = len(points_xy); rng = np.random.default_rng(1234)
-    for _ in range(iters):
-        idx = rng.choice(N, size=3, replace=False)
-        p1, p2, p3 = points_xy[idx]
-        area = abs(0.5*((p2[0]-p1[0])*(p3[1]-p1[1]) - (p3[0]-p1[0])*(p2[1]-p1[1])))
-        if area < 1e-2: continue
-        c = pratt_fit(np.array([p1, p2, p3], dtype=np.float64))
-        if c is None: continue
-        cx, cy, r = c
-        d = np.sqrt((points_xy[:, 0]-cx)**2 + (points_xy[:, 1]-cy)**2)
-        errs = np.abs(d - r)
-        inliers = points_xy[errs < thresh]
-        m = len(inliers)
-        if m > best_in:
-            if m >= 10:
-                c2 = pratt_fit(inliers)
-                if c2 is None: continue
-                cx, cy, r = c2
-            best = (cx, cy, r); best_inliers = inliers; best_in = m
-    if best is None or best_in < min_inliers: return None, None
+    xs = np.ascontiguousarray(points_xy[:, 0]); ys = np.ascontiguousarray(points_xy[:, 1])
+    # draw every 3-point proposal up front, then score them all in one kernel call
+    idx = rng.integers(0, N, size=(iters, 3))
+    P = points_xy[idx].astype(np.float32, copy=False)
+    cx, cy, r = _triplet_circles(P[:, 0], P[:, 1], P[:, 2])
+    if cx.size == 0: return None, None
+    counts = np.zeros(cx.size, dtype=np.int64)
+    _score_inliers(xs, ys, cx, cy, r, float(thresh), counts)
+    k = int(np.argmax(counts)); best_in = int(counts[k])
+    if best_in < min_inliers: return None, None
+    best = (float(cx[k]), float(cy[k]), float(r[k]))
+    best_inliers = points_xy[np.abs(np.sqrt((xs-best[0])**2 + (ys-best[1])**2) - best[2]) < thresh]
+    if len(best_inliers) >= 10:
+        c2 = pratt_fit(best_inliers)
+        if c2 is not None: best = c2
     return best, best_inliers
 
+HOUGH_REFIT_MAX_ITERS = 20
+HOUGH_MAX_RMS = 0.5  # fraction of thresh
+
+def hough_circle(roi_gray: np.ndarray, points_xy: np.ndarray, x0: int, y0: int, *,
+                 edge_high: int, thresh=2.0, min_inliers=60):
+    """Fast path: OpenCV's Hough accumulator on the ROI crop; (None, None) means fall back to RANSAC."""
+    if not hasattr(cv2, "HOUGH_GRADIENT_ALT") or len(points_xy) < 20: return None, None
+    h, w = roi_gray.shape[:2]
+    circles = cv2.HoughCircles(roi_gray, cv2.HOUGH_GRADIENT_ALT, dp=1.5, minDist=max(max(h, w)//2, 1),
+                               param1=max(int(edge_high), 1), param2=0.8, minRadius=5, maxRadius=max(h, w))
+    if circles is None: return None, None
+    cx, cy, r = (float(v) for v in circles[0, 0])  # strongest candidate comes first
+    xs = points_xy[:, 0]; ys = points_xy[:, 1]
+    best = (cx + x0, cy + y0, r); mask = None
+    # Hough is quantised by dp: alternate inlier selection and Pratt refit until the set is stable
+    for _ in range(HOUGH_REFIT_MAX_ITERS):
+        new_mask = np.abs(np.sqrt((xs-best[0])**2 + (ys-best[1])**2) - best[2]) < thresh
+        if mask is not None and np.array_equal(new_mask, mask): break
+        mask = new_mask
+        if np.count_nonzero(mask) < max(10, min_inliers): return None, None
+        c2 = pratt_fit(points_xy[mask])
+        if c2 is None: return None, None
+        best = c2
+    else:
+        return None, None  # never settled, e.g. two nearby edges pulling the fit back and forth
+    resid = np.sqrt((xs[mask]-best[0])**2 + (ys[mask]-best[1])**2) - best[2]
+    # same acceptance as a RANSAC consensus, plus a tight residual so a fit between edges is rejected
+    if float(np.sqrt(np.mean(resid*resid))) > HOUGH_MAX_RMS * thresh: return None, None
+    return best, points_xy[mask]
+
 def arc_from_inliers(center, inliers_xy):
     cx, cy = center
     ang = np.degrees(np.arctan2(inliers_xy[:, 1]-cy, inliers_xy[:, 0]-cx)) % 360.0
@@ -85,10 +203,32 @@ def classify_arc(coverage_deg, q_min=70, q_max=110, s_min=140, s_max=220, full_m
     if q_min <= coverage_deg <= q_max: return "quarter"
     return f"arc({coverage_deg:.1f}°)"
 
-def draw_arc_overlay(bgr, circle, arc, tag_text, color=(0,255,0), line_th=1, font_scale=0.55, text_th=1):
+def arcs_from_inliers(centers, inliers_list):
+    # arc_from_inliers for many ROIs at once: one arctan2/sort over the concatenated inliers
+    counts = np.fromiter((len(a) for a in inliers_list), dtype=np.int64, count=len(inliers_list))
+    gid = np.repeat(np.arange(len(counts)), counts); first = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    xy = np.concatenate(inliers_list); c = np.asarray(centers, dtype=np.float64)[gid]
+    ang = np.degrees(np.arctan2(xy[:, 1]-c[:, 1], xy[:, 0]-c[:, 0])) % 360.0
+    ang = ang[np.lexsort((ang, gid))]
+    # successor of each angle within its ROI; the last one wraps to that ROI's first angle
+    nxt = np.arange(1, len(ang)+1); is_last = np.zeros(len(ang), dtype=bool); is_last[first+counts-1] = True
+    nxt[is_last] = first
+    diffs = ang[nxt] - ang; diffs[is_last] += 360.0
+    # first index of the largest gap per ROI (same tie-break as np.argmax)
+    order = np.lexsort((np.arange(len(ang)), -diffs, gid)); max_gap_idx = order[first]
+    coverage = 360.0 - diffs[max_gap_idx]; start = ang[nxt[max_gap_idx]]
+    return start, start + coverage, coverage
+
+def classify_arcs(coverage_deg: np.ndarray, q_min=70, q_max=110, s_min=140, s_max=220, full_min=300):
+    cov = np.asarray(coverage_deg)
+    kinds = np.select([cov >= full_min, (s_min <= cov) & (cov <= s_max), (q_min <= cov) & (cov <= q_max)],
+                      ["circle", "semicircle", "quarter"], default="")
+    return [k or f"arc({c:.1f}°)" for k, c in zip(kinds.tolist(), cov.tolist())]
+
+def draw_arc_overlay(bgr, circle, arc, tag_text, color=(0,255,0), line_th=1, font_scale=0.55, text_th=1, inplace=False):
     cx = int(round(circle[0])); cy = int(round(circle[1])); r = int(round(circle[2]))
     start_deg = float(arc[0]); end_deg = float(arc[1])
-    over = bgr.copy()
+    over = bgr if inplace else bgr.copy()
     bgr_color = (int(color[0]), int(color[1]), int(color[2]))
     cv2.ellipse(over, (cx, cy), (r, r), 0.0, start_deg, end_deg, bgr_color, int(line_th), cv2.LINE_AA)
     cv2.circle(over, (cx, cy), 1, bgr_color, -1, cv2.LINE_AA)
@@ -96,13 +236,41 @@ def draw_arc_overlay(bgr, circle, arc, tag_text, color=(0,255,0), line_th=1, fon
                 cv2.FONT_HERSHEY_SIMPLEX, float(font_scale), bgr_color, int(text_th), cv2.LINE_AA)
     return over
 
-def save_arc_mask(out_path: Path, shape_hw, circle, arc, thickness=1):
-    h, w = shape_hw
-    mask = np.zeros((h, w), dtype=np.uint8)
+def write_png(out_path: Path, img, compression=1):
+    # imencode + tofile releases the GIL while deflating and also handles non-ASCII paths
+    ok, buf = cv2.imencode(".png", img, [cv2.IMWRITE_PNG_COMPRESSION, int(compression)])
+    if not ok: raise IOError(f"Failed to encode image: {out_path}")
+    buf.tofile(str(out_path))
+
+_IO_POOL: Optional[ThreadPoolExecutor] = None
+def _io_pool() -> ThreadPoolExecutor:
+    # one small writer pool per process; PNG encoding overlaps the next ROI's fit
+    global _IO_POOL
+    if _IO_POOL is None: _IO_POOL = ThreadPoolExecutor(max_workers=2)
+    return _IO_POOL
+
+def _drop_io_pool():
+    # a forked child inherits the executor but not its threads, so submitted writes would never run
+    global _IO_POOL
+    _IO_POOL = None
+
+if hasattr(os, "register_at_fork"): os.register_at_fork(after_in_child=_drop_io_pool)
+
+_MASK_TLS = threading.local()
+def _mask_scratch(shape_hw):
+    # per-thread reusable mask buffer; safe because each save encodes before returning
+    buf = getattr(_MASK_TLS, "buf", None)
+    if buf is None or buf.shape != tuple(shape_hw): buf = _MASK_TLS.buf = np.zeros(shape_hw, dtype=np.uint8)
+    else: buf.fill(0)
+    return buf
+
+def save_arc_mask(out_path: Path, shape_hw, circle, arc, thickness=1, out=None):
+    if out is None: mask = _mask_scratch(shape_hw)
+    else: mask = out; mask.fill(0)
     cx, cy, r = int(round(circle[0])), int(round(circle[1])), int(round(circle[2]))
     start_deg, end_deg, _ = arc
     cv2.ellipse(mask, (cx, cy), (r, r), 0.0, float(start_deg), float(end_deg), 255, int(thickness), cv2.LINE_AA)
-    cv2.imwrite(str(out_path), mask)
+    write_png(out_path, mask)
 
 def write_csv_header(f, px_per_mm):
     w = csv.writer(f)
@@ -139,6 +307,109 @@ def write_radius_diameter_reports(out_dir: Path, image_path: Path, results, px_p
         if new_file: w.writerow(headers)
         w.writerows(rows)
 
+# ---------------- Per-image processing ----------------
+def process_image(img_path: Path, boxes: List[Tuple[int,int,int,int]], overwrite: bool, *,
+                  mm_per_px: float, edge_low:int, edge_high:int, iters:int, thresh:float, min_in:int,
+                  use_hough: bool = False) -> float:
+    """Measure every ROI of one image and write its outputs; returns the cycle time in seconds.
+
+    Module-level (no Qt state) so it can be shipped to a ProcessPoolExecutor worker.
+    """
+    T0 = time.time()
+    img_dir = img_path.parent; out_dir = img_dir / f"{img_path.stem}_circle_outputs"; out_dir.mkdir(parents=True, exist_ok=True)
+    bgr, proc = _DECODE_CACHE.get_or_preprocess(img_path)
+    io = _io_pool(); pending = []
+    overlay_all = None; results = []; rows = []; csv_path = out_dir / "circle_report_multi.csv"
+    # pass 1: fit every ROI; pass 2 (after one batched arc/classify) writes overlays + rows
+    fits = []
+    for i,(x0,y0,x1,y1) in enumerate(boxes, start=1):
+        t0=time.time(); nz = cv2.findNonZero(cv2.Canny(proc[y0:y1, x0:x1], edge_low, edge_high))
+        # fewer edge points than min_in can never yield a valid circle, so skip RANSAC outright
+        if nz is None or len(nz) < max(20, min_in): print(f"{img_path.name} – ROI #{i}: too few edge points, skipped. ({time.time()-t0:.2f}s)"); continue
+        pts = nz.reshape(-1, 2).astype(np.float32); pts += np.array([x0, y0], dtype=np.float32)
+        circle = None
+        if use_hough: circle, inliers_xy = hough_circle(proc[y0:y1, x0:x1], pts, x0, y0, edge_high=edge_high, thresh=thresh, min_inliers=min_in)
+        if circle is None: circle, inliers_xy = ransac_circle(pts, iters=ransac_budget(iters, len(pts), min_in), thresh=thresh, min_inliers=min_in)
+        if circle is None: print(f"{img_path.name} – ROI #{i}: could not fit a circle. ({time.time()-t0:.2f}s)"); continue
+        fits.append((i, (x0,y0,x1,y1), circle, inliers_xy, time.time()-t0))
+    if fits:
+        starts, ends, covs = arcs_from_inliers([(f[2][0], f[2][1]) for f in fits], [f[3] for f in fits])
+        kinds = classify_arcs(covs)
+    for k,(i,(x0,y0,x1,y1),circle,inliers_xy,dt) in enumerate(fits):
+        arc = (float(starts[k]), float(ends[k]), float(covs[k])); kind = kinds[k]
+        tag = f"ROI#{i}  {kind}  r={circle[2]:.1f}px  d={2*circle[2]:.1f}px"
+        if overlay_all is None: overlay_all = bgr.copy()
+        draw_arc_overlay(overlay_all, circle, arc, tag, color=(0,255,0), line_th=1, font_scale=0.55, text_th=1, inplace=True)
+        # per-ROI preview is a crop of the shared overlay instead of a second full-frame draw
+        over_one = overlay_all[max(0,y0-10):y1+10, max(0,x0-10):x1+10].copy()
+        p_one = out_dir / f"overlay_roi_{i}.png"; p_mask = out_dir / f"roi_arc_mask_{i}.png"
+        if overwrite or not p_one.exists(): pending.append(io.submit(write_png, p_one, over_one))
+        if overwrite or not p_mask.exists(): pending.append(io.submit(save_arc_mask, p_mask, bgr.shape[:2], circle, arc, 1))
+        rows.append(row_for(circle, arc, i, len(inliers_xy), kind, mm_per_px))
+        results.append((i, circle, arc[2]))
+        print(f"{img_path.name} – ROI #{i}: {kind}, r={circle[2]:.2f}px, d={2*circle[2]:.2f}px, arc={arc[2]:.1f}°, inliers={len(inliers_xy)}, time={dt:.2f}s")
+    # one buffered write per image; an empty run only touches the CSV to clear stale rows
+    mode = "w" if overwrite or not csv_path.exists() else "a"
+    if rows or (overwrite and csv_path.exists()):
+        with open(csv_path, mode, newline="", encoding="utf-8") as fcsv:
+            w = write_csv_header(fcsv, mm_per_px) if mode=="w" else csv.writer(fcsv)
+            w.writerows(rows)
+    p_all = out_dir / "overlay_all_rois.png"
+    if overlay_all is None:
+        # nothing fitted: no overlay to encode; with overwrite on, drop one left by an earlier run
+        if overwrite: p_all.unlink(missing_ok=True)
+    elif overwrite or not p_all.exists(): pending.append(io.submit(write_png, p_all, overlay_all))
+    write_radius_diameter_reports(out_dir, img_path, results, mm_per_px)
+    txt_path = out_dir / "circle_report_summary.txt"
+    if results:
+        radii=np.fromiter((c[2] for (_,c,_) in results), dtype=np.float64, count=len(results)); diams=2.0*radii
+        def stats(arr): m=float(arr.mean()); s=float(arr.std(ddof=1)) if arr.size>1 else 0.0; return m,s, (s/m*100.0 if m else 0.0)
+        r_mean,r_std,r_cv = stats(radii); d_mean,d_std,d_cv = stats(diams)
+        lines=[f"Total ROIs measured: {len(results)}","",f"Radius (px):   mean={r_mean:.6f}  std={r_std:.6f}  CV%={r_cv:.3f}",
+               f"Diameter (px): mean={d_mean:.6f}  std={d_std:.6f}  CV%={d_cv:.3f}"]
+        if mm_per_px>0:
+            # CV% is scale-invariant, so the mm stats reuse the px CVs
+            inv=1.0/mm_per_px; (rm_mean,rm_std),(dm_mean,dm_std) = np.array([[r_mean,r_std],[d_mean,d_std]])*inv
+            lines+=["",f"(Scale {mm_per_px:.6f} px/mm = {inv:.6f} mm/px)",
+                    f"Radius (mm):   mean={rm_mean:.6f}  std={rm_std:.6f}  CV%={r_cv:.3f}",
+                    f"Diameter (mm): mean={dm_mean:.6f}  std={dm_std:.6f}  CV%={d_cv:.3f}"]
+        txt_path.write_text("\n".join(lines), encoding="utf-8")
+    else:
+        txt_path.write_text("No valid ROIs measured.", encoding="utf-8")
+    for fut in pending: fut.result()  # wait for PNG writes and surface any I/O error
+    return time.time() - T0
+
+def _init_pool_worker():
+    # each worker already gets a core; OpenCV's or numba's own thread pool on top would oversubscribe the CPU
+    cv2.setNumThreads(1)
+    if NUMBA_AVAILABLE: set_num_threads(1)
+    # a worker sees each image once, so caching decoded frames there only pins memory
+    _DECODE_CACHE.max_items = 0
+    _drop_io_pool()
+
+class SaveAllWorker(QtCore.QThread):
+    # Runs the batch on a process pool so the GUI thread stays responsive
+    progress = QtCore.pyqtSignal(int, int)          # (done, total)
+    finished_ok = QtCore.pyqtSignal(list, float)    # ([(name, seconds)], total seconds)
+    failed = QtCore.pyqtSignal(str)
+
+    def __init__(self, jobs, params, overwrite: bool):
+        super().__init__()
+        self.jobs = jobs; self.params = params; self.overwrite = overwrite
+
+    def run(self):
+        try:
+            T0 = time.time(); times = []
+            # spawn, not fork: this runs on a QThread of a process holding Qt, numba and writer threads
+            with ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("spawn"),
+                                     initializer=_init_pool_worker) as ex:
+                futs = {ex.submit(process_image, p, b, self.overwrite, **self.params): p for p, b in self.jobs}
+                for done, fut in enumerate(as_completed(futs), start=1):
+                    times.append((futs[fut].name, fut.result())); self.progress.emit(done, len(futs))
+            self.finished_ok.emit(times, time.time() - T0)
+        except Exception as e:
+            self.failed.emit(str(e))
+
 # ---------------- ROI Canvas (unchanged drawing, themed border) ----------------
 class RoiCanvas(QLabel):
     roisChanged = QtCore.pyqtSignal()
@@ -336,9 +607,11 @@ class ROIWindow(QMainWindow):
 
         self.folder: Optional[Path] = None
         self.images: List[Path] = []
+        self._image_index: Dict[Path, int] = {}
         self.current_path: Optional[Path] = None
         self.roi_cache: Dict[Path, List[Tuple[int,int,int,int]]] = {}
         self._sidebar_saved_w = self.IDEAL_SIDEBAR_W
+        self._save_worker: Optional[SaveAllWorker] = None
 
         self.canvas = RoiCanvas()
 
@@ -398,6 +671,8 @@ class ROIWindow(QMainWindow):
         form.addRow("mm_per_px:", self.mmPerPx); form.addRow("edge_low:", self.edgeLow)
         form.addRow("edge_high:", self.edgeHigh); form.addRow("ransac_iters:", self.ransacIters)
         form.addRow("ransac_thresh:", self.ransacThresh); form.addRow("ransac_min_inliers:", self.ransacMinIn)
+        self.chkHough = QCheckBox("Try Hough fast path before RANSAC"); self.chkHough.setChecked(False)
+        form.addRow(self.chkHough)
         boxParams = QGroupBox("Parameters"); boxParams.setLayout(form)
 
         self.btnSave = QPushButton("  Save Current"); self.btnSave.setProperty("variant", "secondary")
@@ -508,7 +783,7 @@ class ROIWindow(QMainWindow):
 
     def _scan_images(self):
         # reset UI state
-        self.images.clear()
+        self.images.clear(); self._image_index.clear()
         self.thumbs.clear()
         self.current_path = None
 
@@ -521,6 +796,7 @@ class ROIWindow(QMainWindow):
         for p in sorted(self.folder.iterdir()):  # <-- no recursion here
             if p.is_file() and p.suffix.lower() in exts:
                 self.images.append(p)
+        self._image_index = {p: i for i, p in enumerate(self.images)}
 
         # If nothing found directly in the main folder, show a popup and stop
         if not self.images:
@@ -545,6 +821,7 @@ class ROIWindow(QMainWindow):
                 pass
             item.setData(Qt.UserRole, str(path))
             self.thumbs.addItem(item)
+        self._refresh_all_thumbs()
 
         if self.images:
             self.thumbs.setCurrentRow(0)
@@ -556,7 +833,7 @@ class ROIWindow(QMainWindow):
         row = self.thumbs.currentRow()
         if 0 <= row < len(self.images):
             path = self.images[row]
-            try: bgr = imread_any(path)
+            try: bgr = _DECODE_CACHE.get_or_decode(path)  # shared with process_image, so Save Current skips the re-decode
             except Exception as e: QMessageBox.critical(self, "Read error", str(e)); return
             self.current_path = path; self.canvas.loadBGR(bgr)
             boxes = self.roi_cache.get(path, []); self.canvas.setRoisImageBoxes(boxes)
@@ -571,7 +848,7 @@ class ROIWindow(QMainWindow):
         if not self.current_path: return
         boxes = self.canvas.roisImageBoxes()
         self.roi_cache[self.current_path] = boxes
-        idx = self.images.index(self.current_path) if self.current_path in self.images else -1
+        idx = self._image_index.get(self.current_path, -1)
         if idx >= 0: self._update_thumb_highlight(idx)
         self._update_count()
 
@@ -580,8 +857,17 @@ class ROIWindow(QMainWindow):
         has = bool(self.roi_cache.get(path))
         item.setBackground(QtGui.QBrush(QtGui.QColor(35,78,57) if has else QtGui.QColor(27,32,48)))
 
+    def _refresh_all_thumbs(self):
+        # bulk re-highlight with repaints batched into one
+        self.thumbs.setUpdatesEnabled(False)
+        try:
+            for i in range(len(self.images)): self._update_thumb_highlight(i)
+        finally:
+            self.thumbs.setUpdatesEnabled(True)
+
     def _update_count(self):
-        total = len(self.images); annotated = sum(1 for p in self.images if self.roi_cache.get(p))
+        # roi_cache can outlive a folder switch, so only count keys that belong to this folder
+        total = len(self.images); annotated = sum(1 for p, b in self.roi_cache.items() if b and p in self._image_index)
         self.lblCount.setText(f"Annotated: {annotated}/{total}")
 
     # ---------- Save / Process (unchanged logic + overwrite toggle) ----------
@@ -593,6 +879,7 @@ class ROIWindow(QMainWindow):
             iters=int(self.ransacIters.value()),
             thresh=float(self.ransacThresh.value()),
             min_in=int(self.ransacMinIn.value()),
+            use_hough=self.chkHough.isChecked(),
         )
 
     def _save_current(self):
@@ -601,69 +888,41 @@ class ROIWindow(QMainWindow):
         boxes = self.canvas.roisImageBoxes()
         if not boxes:
             QMessageBox.information(self, "No ROIs", "Draw one or more ROIs first."); return
-        t0 = time.time()
-        self._process_image(self.current_path, boxes, **self._collect_params())
-        QMessageBox.information(self, "Processing Complete", f"Image processed!\nCycle time: {time.time()-t0:.2f} s")
+        dt = process_image(self.current_path, boxes, self.chkOverwrite.isChecked(), **self._collect_params())
+        QMessageBox.information(self, "Processing Complete", f"Image processed!\nCycle time: {dt:.2f} s")
 
     def _save_all(self):
         if not self.roi_cache:
             QMessageBox.information(self, "Nothing to save", "No ROIs on any image."); return
-        params = self._collect_params(); count=0; T0=time.time(); times=[]
-        for path, boxes in self.roi_cache.items():
-            if boxes:
-                t=time.time(); self._process_image(path, boxes, **params); times.append((path.name, time.time()-t)); count+=1
-        msg=[f"Processed {count} image(s) with ROIs.", f"Total processing time: {time.time()-T0:.2f} s", "", "Cycle times:"]
+        if self._save_worker is not None and self._save_worker.isRunning(): return
+        jobs = [(p, b) for p, b in self.roi_cache.items() if b]
+        self._save_worker = SaveAllWorker(jobs, self._collect_params(), self.chkOverwrite.isChecked())
+        self._save_worker.progress.connect(self._on_save_all_progress)
+        self._save_worker.finished_ok.connect(self._on_save_all_done)
+        self._save_worker.failed.connect(self._on_save_all_failed)
+        self.btnSaveAll.setEnabled(False); self.btnSaveAll.setText(f"  Processing 0/{len(jobs)}…")
+        self._save_worker.start()
+
+    def _on_save_all_progress(self, done: int, total: int):
+        self.btnSaveAll.setText(f"  Processing {done}/{total}…")
+
+    def _reset_save_all_button(self):
+        self.btnSaveAll.setEnabled(True); self.btnSaveAll.setText("  Final Save · Verify")
+
+    def _on_save_all_done(self, times, total_s: float):
+        self._reset_save_all_button()
+        msg=[f"Processed {len(times)} image(s) with ROIs.", f"Total processing time: {total_s:.2f} s", "", "Cycle times:"]
         for n,t in times: msg.append(f"  • {n}: {t:.2f} s")
         if times: msg.append(f"\nAverage: {sum(t for _,t in times)/len(times):.2f} s/image")
         QMessageBox.information(self, "Save All Complete", "\n".join(msg))
 
-    def _process_image(self, img_path: Path, boxes: List[Tuple[int,int,int,int]], *,
-                       mm_per_px: float, edge_low:int, edge_high:int, iters:int, thresh:float, min_in:int):
-        img_dir = img_path.parent; out_dir = img_dir / f"{img_path.stem}_circle_outputs"; out_dir.mkdir(parents=True, exist_ok=True)
-        bgr = imread_any(img_path); gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY); proc = preprocess(gray, clahe=True, blur_ksize=5)
-        overlay_all = bgr.copy(); results = []; csv_path = out_dir / "circle_report_multi.csv"
-        overwrite = self.chkOverwrite.isChecked()
-        mode = "w" if overwrite or not csv_path.exists() else "a"
-        with open(csv_path, mode, newline="", encoding="utf-8") as fcsv:
-            w = write_csv_header(fcsv, mm_per_px) if mode=="w" else csv.writer(fcsv)
-            for i,(x0,y0,x1,y1) in enumerate(boxes, start=1):
-                t0=time.time(); roi = proc[y0:y1, x0:x1]
-                edges = cv2.Canny(roi, edge_low, edge_high); ys, xs = np.where(edges > 0)
-                if len(xs) < 20: print(f"{img_path.name} – ROI #{i}: too few edge points, skipped. ({time.time()-t0:.2f}s)"); continue
-                pts = (np.stack([xs, ys], axis=1).astype(np.float64) + np.array([x0, y0], dtype=np.float64))
-                circle, inliers_xy = ransac_circle(pts, iters=iters, thresh=thresh, min_inliers=min_in)
-                if circle is None: print(f"{img_path.name} – ROI #{i}: could not fit a circle. ({time.time()-t0:.2f}s)"); continue
-                arc = arc_from_inliers((circle[0],circle[1]), inliers_xy); kind = classify_arc(arc[2])
-                tag = f"ROI#{i}  {kind}  r={circle[2]:.1f}px  d={2*circle[2]:.1f}px"
-                over_one = draw_arc_overlay(bgr, circle, arc, tag, color=(0,255,0), line_th=1, font_scale=0.55, text_th=1)
-                p_one = out_dir / f"overlay_roi_{i}.png"; p_mask = out_dir / f"roi_arc_mask_{i}.png"
-                if overwrite or not p_one.exists(): cv2.imwrite(str(p_one), over_one)
-                if overwrite or not p_mask.exists(): save_arc_mask(p_mask, bgr.shape[:2], circle, arc, thickness=1)
-                overlay_all = draw_arc_overlay(overlay_all, circle, arc, tag, color=(0,255,0), line_th=1, font_scale=0.55, text_th=1)
-                w.writerow(row_for(circle, arc, i, len(inliers_xy), kind, mm_per_px))
-                results.append((i, circle, arc[2]))
-                print(f"{img_path.name} – ROI #{i}: {kind}, r={circle[2]:.2f}px, d={2*circle[2]:.2f}px, arc={arc[2]:.1f}°, inliers={len(inliers_xy)}, time={time.time()-t0:.2f}s")
-        p_all = out_dir / "overlay_all_rois.png"
-        if overwrite or not p_all.exists(): cv2.imwrite(str(p_all), overlay_all)
-        write_radius_diameter_reports(out_dir, img_path, results, mm_per_px)
-        txt_path = out_dir / "circle_report_summary.txt"
-        if results:
-            radii=np.array([c[2] for (_,c,_) in results], dtype=float); diams=2.0*radii
-            def stats(arr): m=float(np.mean(arr)); s=float(np.std(arr, ddof=1)) if len(arr)>1 else 0.0; return m,s, (s/m*100.0 if m else 0.0)
-            r_mean,r_std,r_cv = stats(radii); d_mean,d_std,d_cv = stats(diams)
-            lines=[f"Total ROIs measured: {len(results)}","",f"Radius (px):   mean={r_mean:.6f}  std={r_std:.6f}  CV%={r_cv:.3f}",
-                   f"Diameter (px): mean={d_mean:.6f}  std={d_std:.6f}  CV%={d_cv:.3f}"]
-            if mm_per_px>0:
-                inv=1.0/mm_per_px
-                lines+=["",f"(Scale {mm_per_px:.6f} px/mm = {inv:.6f} mm/px)",
-                        f"Radius (mm):   mean={r_mean*inv:.6f}  std={r_std*inv:.6f}  CV%={(r_std/r_mean*100.0 if r_mean else 0):.3f}",
-                        f"Diameter (mm): mean={d_mean*inv:.6f}  std={d_std*inv:.6f}  CV%={(d_std/d_mean*100.0 if d_mean else 0):.3f}"]
-            txt_path.write_text("\n".join(lines), encoding="utf-8")
-        else:
-            txt_path.write_text("No valid ROIs measured.", encoding="utf-8")
+    def _on_save_all_failed(self, err: str):
+        self._reset_save_all_button()
+        QMessageBox.critical(self, "Save All Failed", err)
 
 # ---------------- Entrypoint ----------------
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # frozen builds: pool workers must not re-launch the GUI
     app = QApplication(sys.argv)
     apply_dark_blue_theme(app)
     mw = ROIWindow(); mw.show()
@@ -0,0 +1,80 @@
+# _geom.py
+import threading
+import numpy as np
+
+# ---- Optional JIT for canvas hit-testing ----
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+def _polygon_bbox_np(pts):
+    return (*pts.min(0).tolist(), *pts.max(0).tolist())
+
+def _point_in_poly_np(pts, x, y):
+    xi = pts[:, 0].astype(np.float64); yi = pts[:, 1].astype(np.float64)
+    xj = np.roll(xi, 1); yj = np.roll(yi, 1)
+    cross = (yi > y) != (yj > y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        xc = xi + (y - yi) * (xj - xi) / (yj - yi)
+    return bool(np.count_nonzero(cross & (x < xc)) & 1)
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _polygon_bbox_jit(pts):
+        # (x1, y1, x2, y2) of a non-empty (k, 2) point array in one pass
+        x1 = x2 = pts[0, 0]; y1 = y2 = pts[0, 1]
+        for i in range(1, pts.shape[0]):
+            x = pts[i, 0]; y = pts[i, 1]
+            if x < x1: x1 = x
+            elif x > x2: x2 = x
+            if y < y1: y1 = y
+            elif y > y2: y2 = y
+        return x1, y1, x2, y2
+
+    @njit(cache=True)
+    def _point_in_poly_jit(pts, x, y):
+        # Even-odd ray crossing, same rule as Qt.OddEvenFill
+        inside = False
+        n = pts.shape[0]
+        j = n - 1
+        for i in range(n):
+            xi = float(pts[i, 0]); yi = float(pts[i, 1])
+            xj = float(pts[j, 0]); yj = float(pts[j, 1])
+            if (yi > y) != (yj > y):
+                if x < xi + (y - yi) * (xj - xi) / (yj - yi):
+                    inside = not inside
+            j = i
+        return inside
+
+# Callers look these up on the module (_geom.point_in_poly), so the NumPy versions
+# serve until warm_up() has compiled the kernels and swaps them in.
+polygon_bbox = _polygon_bbox_np
+point_in_poly = _point_in_poly_np
+
+def warm_up():
+    """Compile (or load from numba's cache) the int32 specializations the canvas uses,
+    both for its read-only shape arrays and the writable packed polygon array, then
+    switch polygon_bbox/point_in_poly over to them."""
+    global polygon_bbox, point_in_poly
+    if not NUMBA_AVAILABLE:
+        return
+    pts = np.array([[0, 0], [4, 0], [0, 4]], np.int32)
+    ro = pts.copy()
+    ro.flags.writeable = False
+    for arr in (pts, ro):
+        _polygon_bbox_jit(arr)
+        _point_in_poly_jit(arr, 1, 1)
+    polygon_bbox = _polygon_bbox_jit
+    point_in_poly = _point_in_poly_jit
+
+_warm_up_started = False
+
+def start_warm_up():
+    """Run warm_up() once on a daemon thread so the compile never blocks the GUI thread."""
+    global _warm_up_started
+    if _warm_up_started or not NUMBA_AVAILABLE:
+        return
+    _warm_up_started = True
+    threading.Thread(target=warm_up, name="geom-warm-up", daemon=True).start()
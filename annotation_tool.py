@@ -3,10 +3,30 @@ import os
 import json
 import shutil
 import base64
+import hashlib
+import logging
+import mmap
+import threading
+import numpy as np
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache, partial
+from collections import OrderedDict, defaultdict, deque
 from PyQt5 import QtWidgets, QtGui, QtCore, QtPrintSupport
 from toasts import ToastManager
+from app_prefs import AppPrefs
+import _geom
 from pathlib import Path
 
+# ---- Optional faster JSON parser ----
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+log = logging.getLogger(__name__)
+
 def _app_base_dir() -> Path:
     """
     Root folder of the app (PyInstaller-safe).
@@ -34,6 +54,18 @@ def _candidate_asset_dirs() -> list[Path]:
         base.parent / "assets",
     ]
 
+@lru_cache(maxsize=None)
+def _dir_files(folder: str) -> frozenset:
+    """
+    Names of the regular files in `folder` (normcased), read with a single
+    scandir. A missing folder simply yields an empty set.
+    """
+    try:
+        with os.scandir(folder) as it:
+            return frozenset(os.path.normcase(e.name) for e in it if e.is_file())
+    except OSError:
+        return frozenset()
+
 def find_asset(*names: str) -> Path | None:
     """
     Finds the first existing file among candidate folders and name variants.
@@ -43,20 +75,88 @@ def find_asset(*names: str) -> Path | None:
     for folder in _candidate_asset_dirs():
         for name in names:
             p = (folder / name)
-            if p.is_file():
+            if os.path.normcase(p.name) in _dir_files(str(p.parent)):
                 return p
     return None
 
+@lru_cache(maxsize=None)
+def _icon_from_path(path: str) -> QtGui.QIcon | None:
+    """
+    One shared QIcon per resolved file, so buttons that use the same image
+    (e.g. save.png for Save Current and Final Save) decode it once.
+    """
+    icon = QtGui.QIcon(path)
+    return None if icon.isNull() else icon
+
+def _icon_pixmap(path: str, size: QtCore.QSize, dpr: float) -> QtGui.QPixmap | None:
+    """
+    The icon at `path` rendered once at `size` (logical px) for the given
+    device pixel ratio, shared through QPixmapCache.
+    The PNG is decoded straight to that size (the Media icons are 512x512),
+    so no full-resolution copy is kept around per icon.
+    """
+    key = f"btn-icon:{path}:{size.width()}x{size.height()}@{dpr:g}"
+    pm = QtGui.QPixmapCache.find(key)
+    if pm is None or pm.isNull():
+        reader = QtGui.QImageReader(path)
+        src = reader.size()
+        target = size * dpr
+        if src.isValid() and (src.width() > target.width() or src.height() > target.height()):
+            # Fit inside the icon box like QIcon.pixmap() does, never upscale
+            reader.setScaledSize(src.scaled(target, QtCore.Qt.KeepAspectRatio))
+        img = reader.read()
+        if img.isNull():
+            return None
+        pm = QtGui.QPixmap.fromImage(img)
+        pm.setDevicePixelRatio(dpr)
+        QtGui.QPixmapCache.insert(key, pm)
+    return pm
+
+# QPixmapCache budget (KiB) so a few full-size images survive back-and-forth navigation
+IMAGE_PIXMAP_CACHE_KB = 256 * 1024
+
+def _image_cache_key(path: str) -> str | None:
+    try:
+        return f"image:{path}:{os.stat(path).st_mtime_ns}"
+    except OSError:
+        return None
+
+def image_pixmap(path: str) -> QtGui.QPixmap:
+    """
+    Full-size pixmap for an image, shared through QPixmapCache so returning to
+    a recently viewed image skips the decode. The key includes the file's
+    mtime, so an image changed on disk is decoded again.
+    """
+    key = _image_cache_key(path)
+    if key is None:
+        return QtGui.QPixmap()
+    pm = QtGui.QPixmapCache.find(key)
+    if pm is None or pm.isNull():
+        pm = QtGui.QPixmap(path)
+        if not pm.isNull():
+            QtGui.QPixmapCache.insert(key, pm)
+    return pm
+
+@lru_cache(maxsize=1)
+def _no_annotations_icon() -> QtGui.QIcon:
+    """Shared 50x50 placeholder for unannotated images in the review dialog."""
+    pm = QtGui.QPixmap(50, 50)
+    pm.fill(QtGui.QColor(183, 28, 28))
+    return QtGui.QIcon(pm)
+
+@lru_cache(maxsize=None)
+def _system_folder_icon() -> QtGui.QIcon:
+    """The platform's folder icon, from one shared QFileIconProvider."""
+    return QtWidgets.QFileIconProvider().icon(QtWidgets.QFileIconProvider.Folder)
+
+@lru_cache(maxsize=None)
 def qicon(*names: str) -> QtGui.QIcon | None:
     """
     Convenience: returns a QIcon for the first found asset path, else None.
+    Cached per name tuple so the asset folders are probed only once.
     """
     p = find_asset(*names)
-    if p:
-        icon = QtGui.QIcon(str(p))
-        if not icon.isNull():
-            return icon
-    return None
+    return _icon_from_path(str(p)) if p else None
 
 def set_btn_icon(btn: QtWidgets.QPushButton, fallback_text: str, *names: str):
     """
@@ -69,13 +169,132 @@ def set_btn_icon(btn: QtWidgets.QPushButton, fallback_text: str, *names: str):
     else:
         btn.setText(fallback_text)
 
+def xml_escape(text: str) -> str:
+    """
+    Escape &, < and > for XML text (same as xml.sax.saxutils.escape, which
+    would pull urllib.request/ssl/http into startup just for this).
+    """
+    return text.replace("&", "&amp;").replace(">", "&gt;").replace("<", "&lt;")
+
 # ==================== ANNOTATION TOOL CLASSES ====================
 
+# Shared paint resources (label text, selection handles, in-progress shape)
+_LABEL_TEXT_PEN = QtGui.QPen(QtGui.QColor(255, 255, 255), 2)
+_HANDLE_PEN = QtGui.QPen(QtGui.QColor(0, 0, 0), 1)
+_HANDLE_BRUSH = QtGui.QBrush(QtGui.QColor(255, 255, 0))
+_CURRENT_SHAPE_PEN = QtGui.QPen(QtGui.QColor(255, 0, 0), 2, QtCore.Qt.DashLine)
+
+def _points_array(points):
+    """Shape vertices as a read-only (k, 2) int32 array (float coords truncate like int()).
+    Edits always build a new array, so undo commands and the clipboard share it without copying."""
+    arr = np.asarray(points).astype(np.int32).reshape(-1, 2)
+    arr.flags.writeable = False
+    return arr
+
+def annotation_points(points):
+    """Points of a loaded annotation as one (k, 2) float64 array instead of k small lists.
+    Extra coordinates are dropped and malformed points skipped, as the loaders always did."""
+    try:
+        arr = np.asarray(points, np.float64)
+    except (TypeError, ValueError):  # ragged: some points are short or have extra values
+        arr = np.asarray([p[:2] for p in points if len(p) >= 2], np.float64)
+    if arr.ndim != 2 or arr.shape[1] < 2:
+        return np.empty((0, 2), np.float64)
+    return np.ascontiguousarray(arr[:, :2])
+
+def _qpoints_array(qpoints):
+    return _points_array([(p.x(), p.y()) for p in qpoints])
+
+class _Cmd(ABC):
+    """One undoable canvas edit. Only the affected shape(s) are stored, not a snapshot.
+    do()/undo() mutate canvas.shapes and return the shape index to select afterwards."""
+    @abstractmethod
+    def do(self, canvas): ...
+
+    @abstractmethod
+    def undo(self, canvas): ...
+
+class _AddShape(_Cmd):
+    def __init__(self, index, shape):
+        self.index, self.shape = index, shape
+
+    def do(self, canvas):
+        canvas.shapes.insert(self.index, self.shape)
+        return self.index
+
+    def undo(self, canvas):
+        del canvas.shapes[self.index]
+        return -1
+
+class _DeleteShape(_AddShape):
+    def do(self, canvas):
+        return super().undo(canvas)
+
+    def undo(self, canvas):
+        return super().do(canvas)
+
+class _ReplaceShape(_Cmd):
+    """Move/resize or relabel: swap one shape tuple for another"""
+    def __init__(self, index, old, new):
+        self.index, self.old, self.new = index, old, new
+
+    def do(self, canvas):
+        canvas.shapes[self.index] = self.new
+        return self.index
+
+    def undo(self, canvas):
+        canvas.shapes[self.index] = self.old
+        return self.index
+
+class _ClearShapes(_Cmd):
+    def __init__(self, shapes):
+        self.shapes = tuple(shapes)  # shape tuples/point arrays are immutable; share them
+
+    def do(self, canvas):
+        canvas.shapes.clear()
+        return -1
+
+    def undo(self, canvas):
+        canvas.shapes[:] = self.shapes
+        return -1
+
+class ImageLabel(QtWidgets.QLabel):
+    """Shows the static scaled image; shapes are painted on top in widget coordinates"""
+    def __init__(self, canvas):
+        super().__init__()
+        self.canvas = canvas
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        canvas = self.canvas
+        if not canvas.pixmap or not canvas.original_pixmap:
+            return
+        # Part of the label that is inside the scroll viewport
+        viewport = canvas.viewport()
+        visible = self.rect() & QtCore.QRect(self.mapFrom(viewport, QtCore.QPoint(0, 0)), viewport.size())
+        if visible.isEmpty():
+            return
+        painter = QtGui.QPainter(self)
+        if not painter.isActive():
+            return
+        # Unselected shapes come from the cached overlay; the selected and
+        # in-progress shapes are drawn live on top
+        painter.drawImage(visible.topLeft(), canvas.overlay_image(visible))
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setTransform(canvas.label_transform())
+        canvas.paint_live_shapes(painter)
+        painter.end()
+
 class ZoomableCanvas(QtWidgets.QScrollArea):
+    GRID_SHIFT = 6  # 64 px hit-test grid cells
+    CULL_MARGIN = 64  # image px kept around the viewport for pens and label text
+    # bbox (x1, y1, x2, y2) columns of the corners in update_shape_position order: TL, TR, BL, BR
+    _CORNER_COLS = np.array([[0, 1], [2, 1], [0, 3], [2, 3]])
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.main_window = None
-        self.image_label = QtWidgets.QLabel()
+        self.image_label = ImageLabel(self)
         self.image_label.setBackgroundRole(QtGui.QPalette.Base)
         self.image_label.setSizePolicy(QtWidgets.QSizePolicy.Ignored, QtWidgets.QSizePolicy.Ignored)
         self.image_label.setScaledContents(False)
@@ -88,15 +307,40 @@ class ZoomableCanvas(QtWidgets.QScrollArea):
         self.scale_factor = 1.0
         self.pixmap = None
         self.original_pixmap = None
+        # image->display transform, rebuilt only when the image or zoom changes
+        self._scale_transform = QtGui.QTransform()
         self.shapes = []
+        # Structure-of-arrays mirror of self.shapes for vectorized hit-testing:
+        # normalized bboxes (x1, y1, x2, y2), rect flags, and all polygon
+        # vertices concatenated (shape i starts at _poly_start[i])
+        self._bboxes = np.empty((0, 4), np.int32)
+        self._corners = np.empty((0, 4, 2), np.int32)  # bbox corners, TL, TR, BL, BR
+        self._is_rect = np.empty(0, bool)
+        self._poly_pts = np.empty((0, 2), np.int32)
+        self._poly_start = np.empty(0, np.int64)
+        self._qpolys = []  # QPolygon per polygon shape (None for rects), for drawing
+        # Grid hash: (x >> GRID_SHIFT, y >> GRID_SHIFT) cell -> shape indices
+        self._grid = defaultdict(set)
+        self._index_dirty = False
+        # Compile the (numba) hit-test kernels in the background; NumPy serves until then
+        _geom.start_warm_up()
+        # Viewport-sized ARGB32_Premultiplied render of the unselected shapes,
+        # reused until shapes, selection, zoom or scroll position change
+        self._shapes_version = 0
+        self._overlay = None
+        self._overlay_key = None
         self.current_shape = []
         self.drawing = False
         self.mode = 'rect'
         self.current_label = "object"
+        self._color_cache = {}
+        self._pen_cache = {}
         
-        # Undo/Redo functionality
-        self.undo_stack = []
-        self.redo_stack = []
+        # Undo/Redo functionality (stacks of _Cmd, oldest dropped past 50)
+        self.undo_stack = deque(maxlen=50)
+        self.redo_stack = deque(maxlen=50)
+        self._drag_origin = None  # shape tuple before the current drag
+        self._label_editor_pending = False
         
         # Selection and adjustment
         self.selected_shape_index = -1
@@ -110,18 +354,41 @@ class ZoomableCanvas(QtWidgets.QScrollArea):
         # Zoom settings
         self.zoom_in_factor = 1.25
         self.zoom_out_factor = 1 / self.zoom_in_factor
+        # Zoom bursts rescale with FastTransformation; redo it smoothly once idle
+        self._idle_timer = QtCore.QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.setInterval(150)
+        self._idle_timer.timeout.connect(self._smooth_rescale)
         
         # Enable mouse tracking for better interaction
         self.setMouseTracking(True)
         self.image_label.setMouseTracking(True)
-
-    def load_image(self, path):
-        self.original_pixmap = QtGui.QPixmap(path)
+        
+        # Coalesce auto-saves from an editing burst into one, 500 ms after the last edit
+        self._save_timer = QtCore.QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(500)
+        self._save_timer.timeout.connect(self._flush_save)
+        
+        # Coalesce mouse moves to at most one shape update/repaint per ~16 ms
+        self._pending_pos = None
+        self._move_timer = QtCore.QTimer(self)
+        self._move_timer.setSingleShot(True)
+        self._move_timer.setInterval(16)
+        self._move_timer.timeout.connect(self._flush_move)
+
+    def load_image(self, image):
+        """Show an image, given as a file path or an already decoded QPixmap"""
+        self.original_pixmap = image if isinstance(image, QtGui.QPixmap) else QtGui.QPixmap(image)
         self.pixmap = self.original_pixmap
         self.image_label.setPixmap(self.pixmap)
+        self._scale_transform = QtGui.QTransform()
         self.scale_factor = 1.0
         self.fit_to_window()
+        # A pending auto-save belongs to the previous image (see flush_pending_save)
+        self._save_timer.stop()
         self.shapes.clear()
+        self.shapes_changed()
         self.current_shape.clear()
         self.undo_stack.clear()
         self.redo_stack.clear()
@@ -144,17 +411,32 @@ class ZoomableCanvas(QtWidgets.QScrollArea):
         new_width = int(self.original_pixmap.width() * self.scale_factor)
         new_height = int(self.original_pixmap.height() * self.scale_factor)
         
-        # Scale the original pixmap to maintain quality
+        # Fast scale from the original now; _smooth_rescale restores quality
         self.pixmap = self.original_pixmap.scaled(
             new_width, new_height, 
             QtCore.Qt.KeepAspectRatio, 
-            QtCore.Qt.SmoothTransformation
+            QtCore.Qt.FastTransformation
         )
         self.image_label.setPixmap(self.pixmap)
         self.image_label.resize(self.pixmap.size())
+        self._scale_transform = QtGui.QTransform.fromScale(
+            self.pixmap.width() / self.original_pixmap.width(),
+            self.pixmap.height() / self.original_pixmap.height())
         
         self.adjust_scrollbar(self.horizontalScrollBar(), factor)
         self.adjust_scrollbar(self.verticalScrollBar(), factor)
+        self._idle_timer.start()
+        
+    def _smooth_rescale(self):
+        """Redo the last zoom with SmoothTransformation once zooming has gone idle"""
+        if not self.original_pixmap or not self.pixmap:
+            return
+        self.pixmap = self.original_pixmap.scaled(
+            self.pixmap.size(),
+            QtCore.Qt.KeepAspectRatio,
+            QtCore.Qt.SmoothTransformation
+        )
+        self.image_label.setPixmap(self.pixmap)
         
     def adjust_scrollbar(self, scrollbar, factor):
         scrollbar.setValue(int(factor * scrollbar.value() + ((factor - 1) * scrollbar.pageStep()/2)))
@@ -218,8 +500,8 @@ class ZoomableCanvas(QtWidgets.QScrollArea):
                     self.selected_shape_index = shape_index
                     self.selected_point_index = point_index
                     self.dragging = True
-                    # Save state for undo
-                    self.save_state()
+                    # Remember the shape for undo
+                    self._drag_origin = self.shapes[shape_index]
                 else:
                     self.drawing = True
                     self.current_shape = [pos, pos]
@@ -230,7 +512,7 @@ class ZoomableCanvas(QtWidgets.QScrollArea):
                     self.selected_shape_index = shape_index
                     self.selected_point_index = point_index
                     self.dragging = True
-                    self.save_state()
+                    self._drag_origin = self.shapes[shape_index]
                 else:
                     self.current_shape.append(pos)
             elif self.mode == 'select':
@@ -239,72 +521,209 @@ class ZoomableCanvas(QtWidgets.QScrollArea):
                 self.selected_point_index = point_index
                 if shape_index != -1:
                     self.dragging = True
-                    self.save_state()
+                    self._drag_origin = self.shapes[shape_index]
                 
         elif event.button() == QtCore.Qt.RightButton and self.mode == 'polygon':
             self.finish_polygon()
                 
-        self.update()
+        self.image_label.update()
         
     def mouseMoveEvent(self, event):
-        if self.drawing and self.mode == 'rect' and self.pixmap:
-            pos = self.get_image_coordinates(event.pos())
+        if (self.drawing and self.mode == 'rect') or (self.dragging and self.selected_shape_index != -1):
+            self._pending_pos = event.pos()
+            if not self._move_timer.isActive():
+                self._move_timer.start()
+
+    def _flush_move(self):
+        """Apply the latest queued mouse position (see mouseMoveEvent)"""
+        if self._pending_pos is None or not self.pixmap:
+            return
+        pos = self.get_image_coordinates(self._pending_pos)
+        self._pending_pos = None
+        before = self._moving_bbox()
+        if self.drawing and self.mode == 'rect':
             self.current_shape[1] = pos
-        elif self.dragging and self.selected_shape_index != -1 and self.pixmap:
-            pos = self.get_image_coordinates(event.pos())
+        elif self.dragging and self.selected_shape_index != -1:
             self.update_shape_position(pos)
-        self.update()
+        after = self._moving_bbox()
+        # Repaint only where the dragged shape was and is now
+        if before is not None and after is not None:
+            self.update_image_rect(before | after)
+        else:
+            self.image_label.update()
+
+    def label_transform(self):
+        """Image -> image_label transform: display scale, then the centering offset"""
+        t = QtGui.QTransform(self._scale_transform)
+        t *= QtGui.QTransform.fromTranslate((self.image_label.width() - self.pixmap.width()) / 2,
+                                            (self.image_label.height() - self.pixmap.height()) / 2)
+        return t
+
+    def update_image_rect(self, rect):
+        """Schedule a repaint of an image-space rect (plus room for pens, handles and label text)"""
+        m = self.CULL_MARGIN
+        self.image_label.update(self.label_transform().mapRect(rect.adjusted(-m, -m, m, m)))
+
+    def _moving_bbox(self):
+        """Image-space bbox of the rect being drawn or the shape being dragged"""
+        if self.drawing and len(self.current_shape) == 2:
+            return QtCore.QRect(self.current_shape[0], self.current_shape[1]).normalized()
+        idx = self.selected_shape_index
+        if self.dragging and not self._index_dirty and 0 <= idx < len(self._bboxes):
+            x1, y1, x2, y2 = self._bboxes[idx].tolist()
+            return QtCore.QRect(QtCore.QPoint(x1, y1), QtCore.QPoint(x2, y2))
+        return None
             
     def mouseReleaseEvent(self, event):
+        # Don't drop the last queued move
+        self._move_timer.stop()
+        self._flush_move()
         if self.drawing and self.mode == 'rect' and self.pixmap:
             self.drawing = False
             if self.current_shape and self.current_label:
-                # Save state before adding new shape
-                self.save_state()
-                self.shapes.append(('rect', self.current_shape.copy(), self.current_label))
+                self.execute_command(_AddShape(len(self.shapes), ('rect', _qpoints_array(self.current_shape), self.current_label)))
+                self.selected_shape_index = -1
                 # Trigger auto-save
-                if hasattr(self.main_window, 'auto_save_annotations'):
-                    self.main_window.auto_save_annotations()
+                self._schedule_save()
                 # AUTO-OPEN LABEL EDITOR - USE main_window INSTEAD OF parent()
-                if hasattr(self.main_window, 'auto_open_label_editor'):
-                    QtCore.QTimer.singleShot(100, self.main_window.auto_open_label_editor)
-                else:
-                    print("DEBUG: auto_open_label_editor not found in main_window")
+                self._queue_label_editor()
             self.current_shape.clear()
         elif self.dragging:
             self.dragging = False
+            idx = self.selected_shape_index
+            if self._drag_origin is not None and 0 <= idx < len(self.shapes) and self.shapes[idx] is not self._drag_origin:
+                self.push_command(_ReplaceShape(idx, self._drag_origin, self.shapes[idx]))
+            self._drag_origin = None
             # Trigger auto-save after moving/resizing
-            if hasattr(self.main_window, 'auto_save_annotations'):
-                self.main_window.auto_save_annotations()
-        self.update()
+            self._schedule_save()
+        self.image_label.update()
+
+    def _queue_label_editor(self):
+        """Open the label editor shortly after a shape is created; at most one pending at a time"""
+        if not hasattr(self.main_window, 'auto_open_label_editor'):
+            log.debug("auto_open_label_editor not found in main_window")
+            return
+        if not self._label_editor_pending:
+            self._label_editor_pending = True
+            QtCore.QTimer.singleShot(100, self._open_label_editor)
+
+    def _open_label_editor(self):
+        self._label_editor_pending = False
+        self.main_window.auto_open_label_editor()
+
+    def _schedule_save(self):
+        """(Re)start the auto-save debounce timer"""
+        self._save_timer.start()
+
+    def _flush_save(self):
+        if hasattr(self.main_window, 'auto_save_annotations'):
+            self.main_window.auto_save_annotations()
+
+    def flush_pending_save(self):
+        """Run a debounced auto-save now (call before switching images)"""
+        if self._save_timer.isActive():
+            self._save_timer.stop()
+            self._flush_save()
+
+    def shapes_changed(self):
+        """Mark the hit-test arrays and overlay stale after shapes were added, removed or replaced"""
+        self._index_dirty = True
+        self._shapes_version += 1
+
+    def rebuild_shape_index(self):
+        """Rebuild the NumPy hit-test arrays, cached QPolygons and the grid hash from self.shapes"""
+        n = len(self.shapes)
+        bboxes = np.zeros((n, 4), np.int32)
+        is_rect = np.zeros(n, bool)
+        poly_start = np.zeros(n, np.int64)
+        poly_arrays, qpolys = [], [None] * n
+        offset = 0
+        grid = defaultdict(set)
+        for i, (shape_type, pts, label) in enumerate(self.shapes):
+            if len(pts):
+                bboxes[i] = _geom.polygon_bbox(pts)
+            if shape_type == 'rect':
+                is_rect[i] = True
+            else:
+                poly_start[i] = offset
+                offset += len(pts)
+                poly_arrays.append(pts)
+                qpolys[i] = QtGui.QPolygon(pts.ravel().tolist())
+            for cell in self._grid_cells(bboxes[i]):
+                grid[cell].add(i)
+        self._bboxes = bboxes
+        self._corners = bboxes[:, self._CORNER_COLS]
+        self._is_rect = is_rect
+        self._poly_pts = np.concatenate(poly_arrays) if poly_arrays else np.empty((0, 2), np.int32)
+        self._poly_start = poly_start
+        self._qpolys = qpolys
+        self._grid = grid
+        self._index_dirty = False
+
+    def _grid_cells(self, bbox):
+        """Grid-hash cells covered by a (x1, y1, x2, y2) bbox"""
+        x1, y1, x2, y2 = (int(v) >> self.GRID_SHIFT for v in bbox)
+        return [(cx, cy) for cx in range(x1, x2 + 1) for cy in range(y1, y2 + 1)]
+
+    def _update_shape_index(self, i):
+        """Refresh the index rows and grid cells of shape i in place after its points moved"""
+        if self._index_dirty or i >= len(self._bboxes):
+            return
+        shape_type, pts, label = self.shapes[i]
+        bbox = _geom.polygon_bbox(pts)
+        old_cells = self._grid_cells(self._bboxes[i])
+        new_cells = self._grid_cells(bbox)
+        if old_cells != new_cells:
+            for cell in old_cells:
+                self._grid[cell].discard(i)
+            for cell in new_cells:
+                self._grid[cell].add(i)
+        self._bboxes[i] = bbox
+        self._corners[i] = self._bboxes[i, self._CORNER_COLS]
+        if shape_type != 'rect':
+            start = self._poly_start[i]
+            self._poly_pts[start:start + len(pts)] = pts
+            self._qpolys[i] = QtGui.QPolygon(pts.ravel().tolist())
 
     def get_shape_at_position(self, pos, threshold=10):
         """Check if position is near any shape or control point"""
-        for i, (shape_type, points, label) in enumerate(self.shapes):
-            if shape_type == 'rect':
-                rect = QtCore.QRect(points[0], points[1]).normalized()
-                # Check if near edges or corners
-                if rect.contains(pos):
+        if not self.shapes:
+            return -1, -1
+        if self._index_dirty or len(self._bboxes) != len(self.shapes):
+            self.rebuild_shape_index()
+        px, py = pos.x(), pos.y()
+        # Only shapes in the cursor's cell and its 8 neighbours can be hit
+        # (threshold < cell size)
+        gx, gy = px >> self.GRID_SHIFT, py >> self.GRID_SHIFT
+        grid = self._grid
+        nearby = set()
+        for cx in (gx - 1, gx, gx + 1):
+            for cy in (gy - 1, gy, gy + 1):
+                cell = grid.get((cx, cy))
+                if cell:
+                    nearby |= cell
+        if not nearby:
+            return -1, -1
+        idx = np.array(sorted(nearby), np.int64)
+        x1, y1, x2, y2 = self._bboxes[idx].T
+        inside = (px >= x1) & (px <= x2) & (py >= y1) & (py <= y2)
+        corner_near = np.abs(self._corners[idx] - (px, py)).sum(-1) < threshold
+        
+        # First matching shape wins, as before
+        for row, i in enumerate(idx.tolist()):
+            if self._is_rect[i]:
+                if inside[row]:
                     return i, -1  # -1 means moving entire shape
-                
-                # Check corners for resizing
-                corners = [
-                    rect.topLeft(), rect.topRight(), 
-                    rect.bottomLeft(), rect.bottomRight()
-                ]
-                for j, corner in enumerate(corners):
-                    if (pos - corner).manhattanLength() < threshold:
-                        return i, j
-                        
-            elif shape_type == 'polygon':
-                # Check if near any point
-                for j, point in enumerate(points):
-                    if (pos - point).manhattanLength() < threshold:
-                        return i, j
-                # Check if inside polygon
-                poly = QtGui.QPolygon(points)
-                if poly.containsPoint(pos, QtCore.Qt.OddEvenFill):
-                    return i, -1
+                if corner_near[row].any():
+                    return i, int(np.argmax(corner_near[row]))
+                continue
+            start = self._poly_start[i]
+            poly = self._poly_pts[start:start + len(self.shapes[i][1])]
+            near = np.abs(poly - (px, py)).sum(1) < threshold
+            if near.any():
+                return i, int(np.argmax(near))
+            if inside[row] and _geom.point_in_poly(poly, px, py):
+                return i, -1
                     
         return -1, -1
 
@@ -313,45 +732,46 @@ class ZoomableCanvas(QtWidgets.QScrollArea):
         if self.selected_shape_index < 0 or self.selected_shape_index >= len(self.shapes):
             return
             
-        shape_type, points, label = self.shapes[self.selected_shape_index]
+        shape_type, pts, label = self.shapes[self.selected_shape_index]
+        px, py = pos.x(), pos.y()
+        new_pts = None
         
         if shape_type == 'rect':
-            rect = QtCore.QRect(points[0], points[1]).normalized()
+            if self._index_dirty:
+                self.rebuild_shape_index()
+            # Normalized bbox and corners are kept current in the shape index
+            x1, y1, x2, y2 = self._bboxes[self.selected_shape_index].tolist()
             
             if self.selected_point_index == -1:  # Moving entire rectangle
-                delta = pos - rect.center()
-                new_tl = points[0] + delta
-                new_br = points[1] + delta
-                self.shapes[self.selected_shape_index] = (shape_type, [new_tl, new_br], label)
+                new_pts = pts + (px - (x1 + x2) // 2, py - (y1 + y2) // 2)
             else:  # Resizing from corner
-                corners = [rect.topLeft(), rect.topRight(), rect.bottomLeft(), rect.bottomRight()]
-                corners[self.selected_point_index] = pos
+                corners = self._corners[self.selected_shape_index].tolist()
+                corners[self.selected_point_index] = (px, py)
                 
                 # Reconstruct rectangle from updated corners
-                new_tl = QtCore.QPoint(min(corners[0].x(), corners[2].x()), min(corners[0].y(), corners[1].y()))
-                new_br = QtCore.QPoint(max(corners[1].x(), corners[3].x()), max(corners[2].y(), corners[3].y()))
-                self.shapes[self.selected_shape_index] = (shape_type, [new_tl, new_br], label)
+                new_pts = [(min(corners[0][0], corners[2][0]), min(corners[0][1], corners[1][1])),
+                           (max(corners[1][0], corners[3][0]), max(corners[2][1], corners[3][1]))]
                 
         elif shape_type == 'polygon':
-            if self.selected_point_index >= 0 and self.selected_point_index < len(points):
+            if self.selected_point_index >= 0 and self.selected_point_index < len(pts):
                 # Move specific point
-                new_points = points.copy()
-                new_points[self.selected_point_index] = pos
-                self.shapes[self.selected_shape_index] = (shape_type, new_points, label)
+                new_pts = pts.copy()
+                new_pts[self.selected_point_index] = (px, py)
             elif self.selected_point_index == -1:  # Moving entire polygon
                 # Calculate center and move all points
-                center = self.get_polygon_center(points)
-                delta = pos - center
-                new_points = [p + delta for p in points]
-                self.shapes[self.selected_shape_index] = (shape_type, new_points, label)
+                center = self.get_polygon_center(pts)
+                new_pts = pts + (px - center.x(), py - center.y())
+        
+        if new_pts is not None:
+            self.shapes[self.selected_shape_index] = (shape_type, _points_array(new_pts), label)
+            self._update_shape_index(self.selected_shape_index)
 
-    def get_polygon_center(self, points):
+    def get_polygon_center(self, pts):
         """Calculate center point of polygon"""
-        if not points:
+        if not len(pts):
             return QtCore.QPoint(0, 0)
-        x_sum = sum(p.x() for p in points)
-        y_sum = sum(p.y() for p in points)
-        return QtCore.QPoint(x_sum // len(points), y_sum // len(points))
+        x, y = (pts.sum(0) // len(pts)).tolist()
+        return QtCore.QPoint(x, y)
 
     def wheelEvent(self, event):
         """Handle zoom with Ctrl+Mouse Wheel"""
@@ -383,42 +803,34 @@ class ZoomableCanvas(QtWidgets.QScrollArea):
 
     def delete_selected_shape(self):
         if self.selected_shape_index != -1:
-            self.save_state()
-            del self.shapes[self.selected_shape_index]
-            self.selected_shape_index = -1
+            idx = self.selected_shape_index
+            self.execute_command(_DeleteShape(idx, self.shapes[idx]))
             # Trigger auto-save - USE main_window
-            if hasattr(self.main_window, 'auto_save_annotations'):
-                self.main_window.auto_save_annotations()
-            self.update()
+            self._schedule_save()
+            self.image_label.update()
 
     def copy_selected_shape(self):
         if self.selected_shape_index != -1:
-            shape_type, points, label = self.shapes[self.selected_shape_index]
-            self.copied_shape = (shape_type, [QtCore.QPoint(p) for p in points], label)
+            # Shape tuples and their point arrays are never mutated in place; share them
+            self.copied_shape = self.shapes[self.selected_shape_index]
 
     def paste_shape(self):
         if self.copied_shape and self.pixmap:
-            self.save_state()
-            shape_type, points, label = self.copied_shape
+            shape_type, pts, label = self.copied_shape
             # Offset the copied shape slightly
-            offset = QtCore.QPoint(20, 20)
-            new_points = [p + offset for p in points]
-            self.shapes.append((shape_type, new_points, label))
-            self.selected_shape_index = len(self.shapes) - 1
+            self.execute_command(_AddShape(len(self.shapes), (shape_type, _points_array(pts + 20), label)))
             # Trigger auto-save
-            if hasattr(self.main_window, 'auto_save_annotations'):
-                self.main_window.auto_save_annotations()
-            self.update()
+            self._schedule_save()
+            self.image_label.update()
 
     def edit_selected_label(self, new_label):
         if self.selected_shape_index != -1:
-            self.save_state()
-            shape_type, points, old_label = self.shapes[self.selected_shape_index]
-            self.shapes[self.selected_shape_index] = (shape_type, points, new_label)
+            idx = self.selected_shape_index
+            shape_type, points, old_label = self.shapes[idx]
+            self.execute_command(_ReplaceShape(idx, self.shapes[idx], (shape_type, points, new_label)))
             # Trigger auto-save
-            if hasattr(self.main_window, 'auto_save_annotations'):
-                self.main_window.auto_save_annotations()
-            self.update()
+            self._schedule_save()
+            self.image_label.update()
 
     def cancel_operation(self):
         if self.mode == 'polygon':
@@ -426,112 +838,116 @@ class ZoomableCanvas(QtWidgets.QScrollArea):
         self.selected_shape_index = -1
         self.drawing = False
         self.dragging = False
-        self.update()
-
-    def save_state(self):
-        """Save current state to undo stack"""
-        state = {
-            'shapes': [(shape_type, [QtCore.QPoint(p) for p in points], label) 
-                      for shape_type, points, label in self.shapes],
-            'current_shape': [QtCore.QPoint(p) for p in self.current_shape],
-            'selected_index': self.selected_shape_index
-        }
-        self.undo_stack.append(state)
+        self.image_label.update()
+
+    def push_command(self, cmd):
+        """Record an edit that has already been applied to self.shapes"""
+        self.undo_stack.append(cmd)
         self.redo_stack.clear()  # Clear redo stack when new action is performed
-        
-        # Limit undo stack size
-        if len(self.undo_stack) > 50:
-            self.undo_stack.pop(0)
+
+    def execute_command(self, cmd):
+        """Apply an edit and record it for undo"""
+        self.selected_shape_index = cmd.do(self)
+        self.shapes_changed()
+        self.push_command(cmd)
 
     def undo(self):
         """Undo last action"""
         if self.undo_stack:
-            # Save current state to redo stack
-            current_state = {
-                'shapes': [(shape_type, [QtCore.QPoint(p) for p in points], label) 
-                          for shape_type, points, label in self.shapes],
-                'current_shape': [QtCore.QPoint(p) for p in self.current_shape],
-                'selected_index': self.selected_shape_index
-            }
-            self.redo_stack.append(current_state)
-            
-            # Restore previous state
-            state = self.undo_stack.pop()
-            self.shapes = [(shape_type, points, label) for shape_type, points, label in state['shapes']]
-            self.current_shape = state['current_shape']
-            self.selected_shape_index = state['selected_index']
-            self.update()
+            cmd = self.undo_stack.pop()
+            self.selected_shape_index = cmd.undo(self)
+            self.redo_stack.append(cmd)
+            self.shapes_changed()
+            self.image_label.update()
 
     def redo(self):
         """Redo last undone action"""
         if self.redo_stack:
-            # Save current state to undo stack
-            current_state = {
-                'shapes': [(shape_type, [QtCore.QPoint(p) for p in points], label) 
-                          for shape_type, points, label in self.shapes],
-                'current_shape': [QtCore.QPoint(p) for p in self.current_shape],
-                'selected_index': self.selected_shape_index
-            }
-            self.undo_stack.append(current_state)
-            
-            # Restore redone state
-            state = self.redo_stack.pop()
-            self.shapes = [(shape_type, points, label) for shape_type, points, label in state['shapes']]
-            self.current_shape = state['current_shape']
-            self.selected_shape_index = state['selected_index']
-            self.update()
+            cmd = self.redo_stack.pop()
+            self.selected_shape_index = cmd.do(self)
+            self.undo_stack.append(cmd)
+            self.shapes_changed()
+            self.image_label.update()
+
+    def overlay_image(self, visible):
+        """Cached overlay for the label-space rect `visible` (all shapes except the selected one)"""
+        key = (self._shapes_version, self.selected_shape_index, visible.getRect(),
+               self.pixmap.width(), self.pixmap.height(), self.image_label.width(), self.image_label.height())
+        if self._overlay is None or key != self._overlay_key:
+            overlay = QtGui.QImage(visible.size(), QtGui.QImage.Format_ARGB32_Premultiplied)
+            overlay.fill(QtCore.Qt.transparent)
+            painter = QtGui.QPainter(overlay)
+            painter.setRenderHint(QtGui.QPainter.Antialiasing)
+            t = self.label_transform()
+            painter.setTransform(t * QtGui.QTransform.fromTranslate(-visible.x(), -visible.y()))
+            self.paint_shapes(painter, t.inverted()[0].mapRect(visible), skip=self.selected_shape_index)
+            painter.end()
+            self._overlay, self._overlay_key = overlay, key
+        return self._overlay
+
+    def paint_live_shapes(self, painter):
+        """Draw the selected shape and the shape being drawn (not part of the cached overlay)"""
+        if self._index_dirty or len(self._bboxes) != len(self.shapes):
+            self.rebuild_shape_index()
+        if 0 <= self.selected_shape_index < len(self.shapes):
+            self._paint_shape(painter, self.selected_shape_index)
+        self.paint_current_shape(painter)
+
+    def paint_shapes(self, painter, visible=None, skip=-1):
+        """Draw shapes (in image coordinates) onto an already-transformed painter.
+        visible: image-space QRect; shapes whose bbox is outside it are skipped.
+        skip: index of a shape to leave out."""
+        if self._index_dirty or len(self._bboxes) != len(self.shapes):
+            self.rebuild_shape_index()
+        if visible is not None and self.shapes:
+            m = self.CULL_MARGIN
+            x1, y1, x2, y2 = self._bboxes.T
+            order = np.flatnonzero((x2 >= visible.left() - m) & (x1 <= visible.right() + m) &
+                                   (y2 >= visible.top() - m) & (y1 <= visible.bottom() + m)).tolist()
+        else:
+            order = range(len(self.shapes))
+        
+        # Draw existing shapes
+        for i in order:
+            if i != skip:
+                self._paint_shape(painter, i)
 
-    def paintEvent(self, event):
-        super().paintEvent(event)
-        if not self.pixmap or not self.original_pixmap:
-            return
-            
-        # Create a new pixmap to draw on (use original for accurate coordinates)
-        temp_pixmap = self.original_pixmap.copy()
-        painter = QtGui.QPainter(temp_pixmap)
+    def _paint_shape(self, painter, i):
+        """Draw shape i (outline, handles if selected, label)"""
+        shape_type, pts, label = self.shapes[i]
+        painter.setPen(self._pen_for(label))
         
-        if not painter.isActive():
-            return
+        if shape_type == 'rect':
+            (ax, ay), (bx, by) = pts.tolist()
+            rect = QtCore.QRect(QtCore.QPoint(ax, ay), QtCore.QPoint(bx, by))
+            painter.drawRect(rect)
             
-        painter.setRenderHint(QtGui.QPainter.Antialiasing)
-        
-        # Draw existing shapes
-        for i, (shape_type, points, label) in enumerate(self.shapes):
-            color = self.get_color_for_label(label)
-            pen = QtGui.QPen(color, 3)
-            painter.setPen(pen)
+            # Draw selection handles if selected
+            if i == self.selected_shape_index:
+                self.draw_selection_handles(painter, rect)
             
-            if shape_type == 'rect':
-                rect = QtCore.QRect(points[0], points[1])
-                painter.drawRect(rect)
-                
-                # Draw selection handles if selected
-                if i == self.selected_shape_index:
-                    self.draw_selection_handles(painter, rect)
-                
-                # Draw label
-                painter.setPen(QtGui.QPen(QtGui.QColor(255, 255, 255), 2))
-                painter.drawText(points[0].x() + 5, points[0].y() - 5, label)
-                
-            elif shape_type == 'polygon':
-                poly = QtGui.QPolygon(points)
-                painter.drawPolygon(poly)
-                
-                # Draw selection handles if selected
-                if i == self.selected_shape_index:
-                    for point in points:
-                        painter.setBrush(QtGui.QBrush(QtGui.QColor(255, 255, 0)))
-                        painter.drawEllipse(point, 4, 4)
-                
-                if points:
-                    painter.setPen(QtGui.QPen(QtGui.QColor(255, 255, 255), 2))
-                    painter.drawText(points[0].x() + 5, points[0].y() - 5, label)
-                    
+            # Draw label
+            painter.setPen(_LABEL_TEXT_PEN)
+            painter.drawText(ax + 5, ay - 5, label)
+            
+        elif shape_type == 'polygon':
+            poly = self._qpolys[i]
+            painter.drawPolygon(poly)
+            
+            # Draw selection handles if selected
+            if i == self.selected_shape_index:
+                painter.setBrush(_HANDLE_BRUSH)
+                for k in range(poly.size()):
+                    painter.drawEllipse(poly.point(k), 4, 4)
+            
+            if len(pts):
+                painter.setPen(_LABEL_TEXT_PEN)
+                painter.drawText(int(pts[0, 0]) + 5, int(pts[0, 1]) - 5, label)
+
+    def paint_current_shape(self, painter):
         # Draw current shape
         if self.current_shape:
-            color = QtGui.QColor(255, 0, 0)  # Red for current shape
-            pen = QtGui.QPen(color, 2, QtCore.Qt.DashLine)
-            painter.setPen(pen)
+            painter.setPen(_CURRENT_SHAPE_PEN)  # Red for current shape
             
             if self.mode == 'rect' and len(self.current_shape) == 2:
                 rect = QtCore.QRect(self.current_shape[0], self.current_shape[1])
@@ -542,21 +958,11 @@ class ZoomableCanvas(QtWidgets.QScrollArea):
                 # Draw points
                 for point in self.current_shape:
                     painter.drawEllipse(point, 3, 3)
-        
-        painter.end()
-        
-        # Scale the annotated pixmap to current display size
-        scaled_pixmap = temp_pixmap.scaled(
-            self.pixmap.size(),
-            QtCore.Qt.KeepAspectRatio,
-            QtCore.Qt.SmoothTransformation
-        )
-        self.image_label.setPixmap(scaled_pixmap)
 
     def draw_selection_handles(self, painter, rect):
         """Draw selection handles around rectangle"""
-        painter.setBrush(QtGui.QBrush(QtGui.QColor(255, 255, 0)))
-        painter.setPen(QtGui.QPen(QtGui.QColor(0, 0, 0), 1))
+        painter.setBrush(_HANDLE_BRUSH)
+        painter.setPen(_HANDLE_PEN)
         
         handles = [
             rect.topLeft(), rect.topRight(), 
@@ -570,9 +976,21 @@ class ZoomableCanvas(QtWidgets.QScrollArea):
         for handle in handles:
             painter.drawRect(handle.x() - 4, handle.y() - 4, 8, 8)
 
+    def _pen_for(self, label):
+        pen = self._pen_cache.get(label)
+        if pen is None:
+            pen = self._pen_cache[label] = QtGui.QPen(self.get_color_for_label(label), 3)
+        return pen
+
     def get_color_for_label(self, label):
+        # Colors depend only on the label string, so hash each label once
+        color = self._color_cache.get(label)
+        if color is None:
+            color = self._color_cache[label] = self._compute_color(label)
+        return color
+
+    def _compute_color(self, label):
         # Generate consistent color based on label
-        import hashlib
         hash_obj = hashlib.md5(label.encode())
         hash_int = int(hash_obj.hexdigest()[:8], 16)
         r = (hash_int >> 16) & 255
@@ -584,30 +1002,27 @@ class ZoomableCanvas(QtWidgets.QScrollArea):
         self.mode = mode
         self.current_shape.clear()
         self.selected_shape_index = -1
-        self.update()
+        self.image_label.update()
 
     def set_label(self, label):
         self.current_label = label
 
     def finish_polygon(self):
         if len(self.current_shape) > 2 and self.current_label:
-            self.save_state()
-            self.shapes.append(('polygon', self.current_shape.copy(), self.current_label))
+            self.execute_command(_AddShape(len(self.shapes), ('polygon', _qpoints_array(self.current_shape), self.current_label)))
+            self.selected_shape_index = -1
             self.current_shape.clear()
             # Trigger auto-save
-            if hasattr(self.main_window, 'auto_save_annotations'):
-                self.main_window.auto_save_annotations()
+            self._schedule_save()
             # AUTO-OPEN LABEL EDITOR FOR POLYGON - USE main_window
-            if hasattr(self.main_window, 'auto_open_label_editor'):
-                QtCore.QTimer.singleShot(100, self.main_window.auto_open_label_editor)
-            self.update()
+            self._queue_label_editor()
+            self.image_label.update()
 
     def get_annotations(self):
         annotations = []
         for shape_type, points, label in self.shapes:
             if shape_type == 'rect':
-                x1, y1 = points[0].x(), points[0].y()
-                x2, y2 = points[1].x(), points[1].y()
+                (x1, y1), (x2, y2) = points[:2].tolist()
                 annotations.append({
                     'label': label,
                     'shape': 'rectangle',
@@ -615,23 +1030,19 @@ class ZoomableCanvas(QtWidgets.QScrollArea):
                     'bbox': [min(x1, x2), min(y1, y2), abs(x2-x1), abs(y2-y1)]
                 })
             elif shape_type == 'polygon':
-                pts = [[p.x(), p.y()] for p in points]
-                x_coords = [p[0] for p in pts]
-                y_coords = [p[1] for p in pts]
+                x_min, y_min = points.min(0).tolist()
+                x_max, y_max = points.max(0).tolist()
                 annotations.append({
                     'label': label,
                     'shape': 'polygon',
-                    'points': pts,
-                    'bbox': [min(x_coords), min(y_coords), 
-                            max(x_coords)-min(x_coords), max(y_coords)-min(y_coords)]
+                    'points': points.tolist(),
+                    'bbox': [x_min, y_min, x_max - x_min, y_max - y_min]
                 })
         return annotations
 
     def clear_annotations(self):
-        self.save_state()
-        self.shapes.clear()
-        self.selected_shape_index = -1
-        self.update()
+        self.execute_command(_ClearShapes(self.shapes))
+        self.image_label.update()
 
     def clear_annotation_items(self):
         """Clear all annotation graphics items"""
@@ -639,11 +1050,106 @@ class ZoomableCanvas(QtWidgets.QScrollArea):
 
     def add_annotation_rect(self, rect, label):
         """Add rectangle annotation to display"""
-        print(f"Adding rectangle: {rect}, label: {label}")
+        log.debug("Adding rectangle: %s, label: %s", rect, label)
 
     def add_annotation_polygon(self, polygon, label):
         """Add polygon annotation to display"""
-        print(f"Adding polygon: {polygon.size()} points, label: {label}")
+        log.debug("Adding polygon: %d points, label: %s", polygon.size(), label)
+
+THUMB_CACHE_MAX_BYTES = 200 * 1024 * 1024
+THUMB_ICON_LIMIT = 200  # decoded thumbnails kept on list items at once
+
+@lru_cache(maxsize=1)
+def _thumb_cache_dir() -> str:
+    base = QtCore.QStandardPaths.writableLocation(QtCore.QStandardPaths.GenericCacheLocation)
+    if not base:
+        base = os.path.expanduser("~/.cache")
+    path = os.path.join(base, "eyres", "thumbs")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def _trim_thumb_cache(max_bytes=THUMB_CACHE_MAX_BYTES):
+    """Evict least-recently-used thumbnails until the cache fits in max_bytes"""
+    try:
+        entries = [e for e in os.scandir(_thumb_cache_dir()) if e.is_file()]
+    except OSError:
+        return
+    stats = [(e.stat().st_atime, e.stat().st_size, e.path) for e in entries]
+    total = sum(size for _, size, _ in stats)
+    for _, size, path in sorted(stats):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+def _read_thumbnail(path, size):
+    """Thumbnail for path, from the disk cache if (path, mtime, size) was seen before"""
+    try:
+        key = f"{path}|{os.stat(path).st_mtime_ns}|{size.width()}x{size.height()}"
+        cache_path = os.path.join(_thumb_cache_dir(), hashlib.sha1(key.encode()).hexdigest() + ".png")
+    except OSError:
+        cache_path = None
+    if cache_path and os.path.exists(cache_path):
+        img = QtGui.QImage(cache_path)
+        if not img.isNull():
+            try:
+                os.utime(cache_path)  # bump atime for LRU eviction
+            except OSError:
+                pass
+            return img
+    img = _decode_thumbnail(path, size)
+    if cache_path and not img.isNull():
+        tmp = f"{cache_path}.{threading.get_ident()}.tmp"
+        if img.save(tmp, "PNG"):
+            try:
+                os.replace(tmp, cache_path)
+            except OSError:
+                pass
+    return img
+
+def _decode_thumbnail(path, size):
+    """Decode an image directly at thumbnail resolution (keeps aspect ratio)"""
+    reader = QtGui.QImageReader(path)
+    reader.setAutoTransform(True)
+    src = reader.size()
+    if src.isValid():
+        reader.setScaledSize(src.scaled(size, QtCore.Qt.KeepAspectRatio))
+        return reader.read()
+    # Format can't report its size up front: full decode, then scale
+    img = reader.read()
+    if img.isNull():
+        return img
+    return img.scaled(size, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+
+class _ThumbnailSignals(QtCore.QObject):
+    loaded = QtCore.pyqtSignal(int, str, QtGui.QImage)  # generation, path, image
+
+class _ThumbnailTask(QtCore.QRunnable):
+    def __init__(self, path, size, generation, signals):
+        super().__init__()
+        self.path, self.size, self.generation, self.signals = path, size, generation, signals
+
+    def run(self):
+        self.signals.loaded.emit(self.generation, self.path, _read_thumbnail(self.path, self.size))
+
+class _TrimThumbCacheTask(QtCore.QRunnable):
+    def run(self):
+        _trim_thumb_cache()
+
+class _PrefetchSignals(QtCore.QObject):
+    loaded = QtCore.pyqtSignal(str, QtGui.QImage)  # pixmap cache key, image
+
+class _PrefetchTask(QtCore.QRunnable):
+    """Decode a full-size image off the GUI thread; QPixmapCache itself is GUI-thread only"""
+    def __init__(self, path, key, signals):
+        super().__init__()
+        self.path, self.key, self.signals = path, key, signals
+
+    def run(self):
+        self.signals.loaded.emit(self.key, QtGui.QImageReader(self.path).read())
 
 class ThumbnailList(QtWidgets.QListWidget):
     def __init__(self, parent=None):
@@ -654,27 +1160,135 @@ class ThumbnailList(QtWidgets.QListWidget):
         self.setFlow(QtWidgets.QListWidget.LeftToRight)
         self.setWrapping(True)
         self.setSpacing(5)
+        # All cells are icon-sized; lets the view skip per-item size queries
+        self.setUniformItemSizes(True)
+        
+        # Thumbnails are decoded on a pool; icons arrive via a queued signal.
+        # Only items in or near the viewport are decoded (see _load_visible).
+        self._pool = QtCore.QThreadPool(self)
+        self._signals = _ThumbnailSignals(self)
+        self._signals.loaded.connect(self._on_thumbnail_loaded)
+        self._generation = 0
+        self._items = {}
+        self._paths = []
+        self._pending = set()         # queued or decoding
+        self._loaded = OrderedDict()  # paths with an icon, least recently visible first
+
+        # Coalesces scroll/resize bursts into one visibility pass
+        self._visible_timer = QtCore.QTimer(self)
+        self._visible_timer.setSingleShot(True)
+        self._visible_timer.setInterval(0)
+        self._visible_timer.timeout.connect(self._load_visible)
         
     def load_images(self, image_paths):
+        self._pool.clear()  # drop queued decodes from a previous folder
+        self._generation += 1
         self.clear()
-        for path in image_paths:
-            item = QtWidgets.QListWidgetItem()
-            pixmap = QtGui.QPixmap(path)
-            if not pixmap.isNull():
-                # Scale pixmap to thumbnail size while maintaining aspect ratio
-                scaled_pixmap = pixmap.scaled(
-                    self.iconSize().width(), 
-                    self.iconSize().height(), 
-                    QtCore.Qt.KeepAspectRatio, 
-                    QtCore.Qt.SmoothTransformation
-                )
-                icon = QtGui.QIcon(scaled_pixmap)
-                item.setIcon(icon)
+        self._items = {}
+        self._paths = list(image_paths)
+        self._pending.clear()
+        self._loaded.clear()
+        # One relayout for the whole folder instead of one per addItem
+        self.setUpdatesEnabled(False)
+        self.setSortingEnabled(False)
+        try:
+            for path in self._paths:
+                item = QtWidgets.QListWidgetItem()
                 item.setText(os.path.basename(path))
                 item.setData(QtCore.Qt.UserRole, path)
                 self.addItem(item)
+                self._items[path] = item
+        finally:
+            self.setUpdatesEnabled(True)
+        self._visible_timer.start()
+        self._pool.start(_TrimThumbCacheTask())
+
+    def item_for(self, path):
+        """The list item showing path, or None"""
+        return self._items.get(path)
+
+    def scrollContentsBy(self, dx, dy):
+        super().scrollContentsBy(dx, dy)
+        self._visible_timer.start()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._visible_timer.start()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._visible_timer.start()
+
+    def _first_row_below(self, y):
+        """First row whose cell extends below viewport y (rows are laid out in order)"""
+        lo, hi = 0, self.count()
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.visualItemRect(self.item(mid)).bottom() < y:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _load_visible(self):
+        """Queue decodes for the visible rows plus one screenful either side"""
+        count = self.count()
+        if not count:
+            return
+        first = min(count - 1, self._first_row_below(0))
+        last = max(first, min(count - 1, self._first_row_below(self.viewport().height())))
+        span = last - first + 1
+        start, stop = max(0, first - span), min(count, last + span + 1)
+
+        # Anything still queued from an earlier scroll position is stale
+        self._pool.clear()
+        self._pending.clear()
+
+        size = self.iconSize()
+        for row in range(first, last + 1):
+            path = self._paths[row]
+            if path in self._loaded:
+                self._loaded.move_to_end(path)
+        # Visible rows first, then the prefetch window around them
+        for row in list(range(first, last + 1)) + list(range(start, first)) + list(range(last + 1, stop)):
+            path = self._paths[row]
+            if path in self._loaded or path in self._pending:
+                continue
+            self._pending.add(path)
+            self._pool.start(_ThumbnailTask(path, size, self._generation, self._signals))
+
+    def _on_thumbnail_loaded(self, generation, path, image):
+        item = self._items.get(path)
+        if generation != self._generation or item is None:
+            return
+        self._pending.discard(path)
+        if not image.isNull():
+            item.setIcon(QtGui.QIcon(QtGui.QPixmap.fromImage(image)))
+        self._loaded[path] = True
+        self._loaded.move_to_end(path)
+        # Bounded: drop the icons that have been off-screen the longest
+        while len(self._loaded) > THUMB_ICON_LIMIT:
+            old, _ = self._loaded.popitem(last=False)
+            self._items[old].setIcon(QtGui.QIcon())
 
 class LabelSelectionDialog(QtWidgets.QDialog):
+    # Opened for every new shape, so the stylesheets are shared constants
+    _TITLE_STYLE = "font-size: 14px; font-weight: bold; margin: 10px;"
+    _STYLE = """
+            QDialog {
+                background-color: #2D2D3C;
+                color: white;
+            }
+            QListWidget {
+                background-color: #454558;
+                color: white;
+            }
+            QLineEdit {
+                background-color: #454558;
+                color: white;
+            }
+        """
+
     def __init__(self, existing_labels, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Select Label")
@@ -685,7 +1299,7 @@ class LabelSelectionDialog(QtWidgets.QDialog):
         
         # Title
         title = QtWidgets.QLabel("Select or Enter Label")
-        title.setStyleSheet("font-size: 14px; font-weight: bold; margin: 10px;")
+        title.setStyleSheet(self._TITLE_STYLE)
         layout.addWidget(title)
         
         # Existing labels list
@@ -694,6 +1308,10 @@ class LabelSelectionDialog(QtWidgets.QDialog):
             layout.addWidget(list_label)
             
             self.list_widget = QtWidgets.QListWidget()
+            # Long label histories: skip per-item size queries and lay out in batches
+            self.list_widget.setUniformItemSizes(True)
+            self.list_widget.setLayoutMode(QtWidgets.QListView.Batched)
+            self.list_widget.setBatchSize(100)
             self.list_widget.addItems(existing_labels)
             self.list_widget.itemDoubleClicked.connect(self.accept_selection)
             layout.addWidget(self.list_widget)
@@ -719,20 +1337,7 @@ class LabelSelectionDialog(QtWidgets.QDialog):
         button_layout.addWidget(btn_cancel)
         layout.addLayout(button_layout)
         
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #2D2D3C;
-                color: white;
-            }
-            QListWidget {
-                background-color: #454558;
-                color: white;
-            }
-            QLineEdit {
-                background-color: #454558;
-                color: white;
-            }
-        """)
+        self.setStyleSheet(self._STYLE)
         
     def accept_selection(self, item):
         self.selected_label = item.text()
@@ -748,10 +1353,389 @@ class LabelSelectionDialog(QtWidgets.QDialog):
 
 # ==================== EMBEDDABLE ANNOTATION TOOL ====================
 
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp", ".tiff", ".tif", ".webp")
+
+_JSON_WS = b" \t\r\n"
+
+def _strip_image_data(raw: bytes) -> bytes:
+    """
+    Replace LabelMe's embedded base64 "imageData" string with null. Loading
+    never uses it, and it is usually most of the file. Only bytes.find is
+    used (memchr speed); anything unexpected leaves `raw` untouched.
+    """
+    key = raw.find(b'"imageData"')
+    while key != -1:
+        colon = key + len(b'"imageData"')
+        while raw[colon:colon + 1] in _JSON_WS and colon < len(raw):
+            colon += 1
+        if raw[colon:colon + 1] == b":":
+            start = colon + 1
+            while raw[start:start + 1] in _JSON_WS and start < len(raw):
+                start += 1
+            if raw[start:start + 1] != b'"':
+                return raw  # already null
+            end = raw.find(b'"', start + 1)
+            if end == -1 or raw.find(b"\\", start + 1, end) != -1:
+                return raw
+            return raw[:key] + b'"imageData": null' + raw[end + 1:]
+        # "imageData" appeared as a value (e.g. a label), keep looking
+        key = raw.find(b'"imageData"', colon)
+    return raw
+
+def load_annotation_json(f):
+    """
+    Parse an annotation JSON from a binary file object, skipping the embedded
+    image data (see _strip_image_data). Uses orjson when installed.
+    """
+    raw = _strip_image_data(f.read())
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+def _copy_file_range(src, dst):
+    flags = getattr(os, "O_CLOEXEC", 0)
+    src_fd = os.open(src, os.O_RDONLY | flags)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | flags, 0o666)
+        try:
+            remaining = os.fstat(src_fd).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(src_fd, dst_fd, remaining)
+                if copied == 0:
+                    # some filesystems (FUSE, procfs, older NFS/overlayfs) report 0
+                    # instead of failing; let fast_copy fall back to a plain copy
+                    raise OSError(f"copy_file_range copied nothing with {remaining} bytes left")
+                remaining -= copied
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+def fast_copy(src, dst):
+    """
+    shutil.copy2 for file paths, but the data is copied inside the kernel:
+    copy_file_range where available (a reflink on btrfs/XFS), otherwise
+    shutil.copyfile, which uses sendfile on Linux.
+    """
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+    try:
+        if not hasattr(os, "copy_file_range"):
+            raise OSError
+        _copy_file_range(src, dst)
+    except OSError:
+        # Unsupported here (old kernel, cross-device, some filesystems)
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
+def write_file_bytes(path, data):
+    """
+    Create/truncate path and write data with unbuffered os.write calls (no
+    Python file object in between).
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0) | getattr(os, "O_CLOEXEC", 0)
+    fd = os.open(path, flags, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+_B64_CHUNK = 48 * 1024  # multiple of 3, so chunks encode without padding
+
+def encode_image_data(path):
+    """
+    Base64 of a file for LabelMe's imageData. The file is mapped rather than
+    read into a bytes object, and encoded block by block into one buffer
+    allocated at its final size.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return ""
+        out = bytearray(4 * ((size + 2) // 3))
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                pos = 0
+                for start in range(0, size, _B64_CHUNK):
+                    encoded = base64.b64encode(view[start:start + _B64_CHUNK])
+                    out[pos:pos + len(encoded)] = encoded
+                    pos += len(encoded)
+            finally:
+                view.release()  # the map can't close while a view is exported
+    return out.decode('ascii')
+
+def _json_default(obj):
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dump_annotation_json(data):
+    """
+    Serialize an annotation dict to indented UTF-8 JSON bytes. Point arrays are
+    written directly by orjson when installed; the stdlib fallback lists them.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(data, indent=2, default=_json_default).encode('utf-8')
+
+def intern_label(label):
+    """Labels repeat across thousands of shapes; intern them so every annotation
+    shares one string object per label"""
+    return sys.intern(label) if type(label) is str else label
+
+def _read_annotation_json(path):
+    try:
+        with open(path, 'rb') as f:
+            return load_annotation_json(f)
+    except Exception as e:
+        return e
+
+def load_annotation_jsons(paths):
+    """
+    Read and parse several annotation JSONs on a thread pool so the file reads
+    overlap. Returns one entry per path, in order: the parsed data, or the
+    exception raised for that file.
+    """
+    if len(paths) < 2:
+        return [_read_annotation_json(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 4)) as pool:
+        return list(pool.map(_read_annotation_json, paths))
+
+# folder -> (directory mtime_ns, images, json_files), see scan_folder
+_scan_cache = {}
+
+def scan_folder(folder):
+    """
+    One scandir pass over `folder`: returns (sorted image paths, JSON file names).
+    The listing is reused while the directory's mtime is unchanged (adding,
+    removing or renaming a file updates it), so reopening a folder is a stat.
+    """
+    mtime = os.stat(folder).st_mtime_ns
+    cached = _scan_cache.get(folder)
+    if cached is not None and cached[0] == mtime:
+        return list(cached[1]), list(cached[2])
+
+    images, json_files = [], []
+    with os.scandir(folder) as it:
+        for entry in it:
+            name = entry.name
+            if name.lower().endswith(IMAGE_EXTS):
+                if entry.is_file():
+                    images.append(entry.path)
+            elif os.path.normcase(name).endswith(".json") and entry.is_file():
+                json_files.append(name)
+    images.sort()
+    _scan_cache[folder] = (mtime, tuple(images), tuple(json_files))
+    return images, json_files
+
 class AnnotationTool(QtWidgets.QWidget):
+    # Stylesheets for dialogs that are rebuilt on every open
+    _TITLE_STYLE = "font-weight: bold; margin: 10px;"
+    _REVIEW_DIALOG_STYLE = """
+            QDialog {
+                background-color: #2D2D3C;
+                color: white;
+            }
+            QPushButton {
+                background-color: #4A90E2;
+                color: white;
+                border: none;
+                padding: 8px;
+                border-radius: 4px;
+                margin: 5px;
+            }
+            QPushButton:hover {
+                background-color: #5BA0F0;
+            }
+            QListWidget {
+                background-color: #454558;
+                color: white;
+                border: 1px solid #555;
+            }
+        """
+    _REVIEW_TITLE_STYLE = "font-size: 16px; font-weight: bold; color: #4A90E2; margin: 10px;"
+    _REVIEW_SUMMARY_STYLE = "margin: 10px; font-weight: bold;"
+
+    # Widget-wide theme applied by apply_dark_theme
+    _DARK_THEME_STYLE = """
+            QMainWindow, QWidget {
+                background-color: #2D2D3C;
+                color: white;
+            }
+            QGroupBox {
+                color: white;
+                border: 2px solid #444;
+                border-radius: 5px;
+                margin-top: 1ex;
+                padding-top: 10px;
+            }
+            QGroupBox::title {
+                subcontrol-origin: margin;
+                left: 10px;
+                padding: 0 5px 0 5px;
+            }
+            QPushButton {
+                background-color: #2d7ef1;
+                color: white;
+                border: none;
+                padding: 6px;
+                border-radius: 4px;
+                font-size: 11px;
+            }
+            QPushButton:hover {
+                background-color: #5BA0F0;
+            }
+            QPushButton:pressed {
+                background-color: #3A80D2;
+            }
+            QLineEdit, QComboBox {
+                background-color: #454558;
+                color: white;
+                border: 1px solid #555;
+                padding: 4px;
+                border-radius: 3px;
+                font-size: 11px;
+            }
+            QListWidget {
+                background-color: #454558;
+                color: white;
+                border: 1px solid #555;
+            }
+            QScrollArea {
+                border: 1px solid #555;
+            }
+        """
+
+    # User guide shown by show_help
+    _HELP_HTML = """
+            <h2>Annotation Tool - User Guide</h2>
+
+            <h3>📁 Getting Started</h3>
+            <ul>
+            <li>Click <b>'Open Image Folder'</b> to load images for annotation</li>
+            <li>Click <b>'Open Folder with Images & Annotations'</b> to load both images and their annotation files</li>
+            <li>Images will appear as thumbnails at the bottom</li>
+            <li>Click any thumbnail to select an image</li>
+            </ul>
+
+            <h3>🎯 Annotation Tools</h3>
+            <ul>
+            <li><b>Rectangle Tool (R):</b> Click and drag to create bounding boxes</li>
+            <li><b>Polygon Tool (P):</b> Click to place points, right-click or use 'Finish Polygon' to complete</li>
+            <li><b>Select Tool (S):</b> Click and drag to move annotations, drag corners to resize</li>
+            </ul>
+
+            <h3>🔧 Basic Operations</h3>
+            <ul>
+            <li><b>Enter Label:</b> Type the object label before annotating</li>
+            <li><b>Label Selection:</b> Click the 📋 button to select from existing labels</li>
+            <li><b>Clear All:</b> Remove all annotations from current image</li>
+            <li><b>Navigation:</b> Use Previous/Next buttons (A/D keys) or click thumbnails</li>
+            </ul>
+
+            <h3>🔄 Annotation Editing</h3>
+            <ul>
+            <li><b>Auto-Label Editor:</b> Label selection opens automatically after creating annotations</li>
+            <li><b>Edit Label (E):</b> Modify selected annotation's label</li>
+            <li><b>Copy (Ctrl+C):</b> Copy selected annotation</li>
+            <li><b>Paste (Ctrl+V):</b> Paste copied annotation</li>
+            <li><b>Delete Selected (Delete/Ctrl+D):</b> Remove currently selected annotation</li>
+            <li><b>Click and Drag:</b> Move annotations or resize using handles</li>
+            </ul>
+
+            <h3>↩️ Undo/Redo</h3>
+            <ul>
+            <li><b>Undo (Ctrl+Z):</b> Reverse last action</li>
+            <li><b>Redo (Ctrl+Y):</b> Restore undone action</li>
+            </ul>
+
+            <h3>🔍 Zoom & View</h3>
+            <ul>
+            <li><b>Zoom In/Out:</b> Use buttons or Ctrl+Mouse Wheel</li>
+            <li><b>Fit to Window:</b> Auto-adjust image to window size</li>
+            <li><b>Pan:</b> Use scrollbars when zoomed in</li>
+            </ul>
+
+            <h3>💾 Saving Annotations</h3>
+            <ul>
+            <li><b>Auto-Save:</b> Annotations are automatically saved in memory</li>
+            <li><b>Save Current:</b> Save annotations for current image only (choose JSON or XML format)</li>
+            <li><b>Overwrite Existing Files:</b> Update annotation files in current folder (choose JSON or XML format)</li>
+            <li><b>Final Save & Verify:</b> Review all annotations before export to new folder (choose JSON or XML format)</li>
+            <li><b>Format Selection:</b> When saving, you can choose between JSON or XML format</li>
+            <li><b>JSON Format:</b> LabelMe compatible format with image data and annotations</li>
+            <li><b>XML Format:</b> Pascal VOC format compatible with popular object detection frameworks</li>
+            </ul>
+
+            <h3>🎨 Interface Features</h3>
+            <ul>
+            <li>Different colors for different labels</li>
+            <li>Real-time annotation display</li>
+            <li>Progress tracking with auto-save status</li>
+            <li>Visual indicators for annotated images in thumbnails</li>
+            <li>Dark theme for comfortable usage</li>
+            <li>Tooltips on all buttons for quick guidance</li>
+            <li>Format selection dialog for flexible export options</li>
+            </ul>
+
+            <h3>⚡ Keyboard Shortcuts</h3>
+            <ul>
+            <li><b>A / Left Arrow:</b> Previous image</li>
+            <li><b>D / Right Arrow:</b> Next image</li>
+            <li><b>R:</b> Rectangle tool</li>
+            <li><b>P:</b> Polygon tool</li>
+            <li><b>S:</b> Select tool</li>
+            <li><b>E:</b> Edit selected annotation label</li>
+            <li><b>Delete / Ctrl+D:</b> Delete selected annotation</li>
+            <li><b>Ctrl+C:</b> Copy selected annotation</li>
+            <li><b>Ctrl+V:</b> Paste annotation</li>
+            <li><b>Ctrl+Z:</b> Undo</li>
+            <li><b>Ctrl+Y:</b> Redo</li>
+            <li><b>Escape:</b> Cancel current operation</li>
+            <li><b>Ctrl + Mouse Wheel:</b> Zoom in/out</li>
+            <li><b>Right-click:</b> Finish polygon (when using polygon tool)</li>
+            </ul>
+
+            <h3>📊 JSON Export Format</h3>
+            <ul>
+            <li><b>imagePath:</b> Full path to the image</li>
+            <li><b>imageName:</b> Just the filename</li>
+            <li><b>imageData:</b> Base64 encoded image data</li>
+            <li><b>imageWidth / imageHeight:</b> Image dimensions</li>
+            <li><b>annotations:</b> All annotation data with labels and coordinates</li>
+            <li><b>exportTime / updatedTime:</b> Timestamps</li>
+            <li><b>Compatible with:</b> LabelMe and custom annotation pipelines</li>
+            </ul>
+
+            <h3>📄 XML Export Format (Pascal VOC)</h3>
+            <ul>
+            <li><b>&lt;folder&gt;:</b> Name of the folder containing the image</li>
+            <li><b>&lt;filename&gt;:</b> Name of the image file</li>
+            <li><b>&lt;path&gt;:</b> Full path to the image file</li>
+            <li><b>&lt;size&gt;:</b> Image dimensions (width, height, depth)</li>
+            <li><b>&lt;object&gt;:</b> Each annotation as a separate object</li>
+            <li><b>&lt;name&gt;:</b> Label name for the object</li>
+            <li><b>&lt;bndbox&gt;:</b> Bounding box coordinates (xmin, ymin, xmax, ymax)</li>
+            <li><b>&lt;pose&gt;, &lt;truncated&gt;, &lt;difficult&gt;:</b> Standard Pascal VOC attributes</li>
+            <li><b>Compatible with:</b> Popular object detection frameworks like YOLO, Faster R-CNN, SSD</li>
+            </ul>
+
+            <h3>🔄 Format Comparison</h3>
+            <ul>
+            <li><b>JSON:</b> Better for web applications, includes image data, smaller file size</li>
+            <li><b>XML:</b> Industry standard for object detection, compatible with most ML frameworks</li>
+            <li><b>Both formats</b> contain the same annotation information</li>
+            <li>You can export in both formats for different use cases</li>
+            </ul>
+            """
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self._toasts = ToastManager.install(self)
+        # Room for recently viewed full-size images, see image_pixmap
+        if QtGui.QPixmapCache.cacheLimit() < IMAGE_PIXMAP_CACHE_KB:
+            QtGui.QPixmapCache.setCacheLimit(IMAGE_PIXMAP_CACHE_KB)
         # Set window size based on parent or default
         if parent:
             self.resize(parent.width() * 0.9, parent.height() * 0.9)
@@ -770,6 +1754,35 @@ class AnnotationTool(QtWidgets.QWidget):
         self.pending_saves = set()
         self.final_save_mode = False
         self.existing_labels = set()  # Track all labels used in the session
+        # LabelMe reads the image from imagePath when imageData is null, and the
+        # image always sits next to the JSON we write; embedding is opt-in
+        self.embed_image_data = AppPrefs().get_embed_image_data()
+        self._sorted_labels_cache = None  # see _sorted_labels
+        # annotation 'shape' -> method adding it to the canvas, see load_annotations
+        self._shape_loaders = {"rectangle": self._load_rect, "polygon": self._load_poly}
+
+        # (button, icon path) pairs applied on first show, see showEvent
+        self._pending_icons = []
+
+        # img_path -> (annotation fingerprint, VOC XML), see save_annotations_as_xml
+        self._xml_cache = {}
+
+        # (img_path, mtime_ns, w, h) -> QPixmap, see thumbnail_pixmap
+        self._thumb_cache = {}
+
+        # Neighbouring images are decoded ahead into QPixmapCache (see prefetch_neighbours)
+        self._prefetch_pool = QtCore.QThreadPool(self)
+        self._prefetch_pool.setMaxThreadCount(2)
+        self._prefetch_signals = _PrefetchSignals(self)
+        self._prefetch_signals.loaded.connect(self._on_prefetched)
+        self._prefetching = set()
+
+        # Keyboard navigation target waiting to be loaded (see _queue_navigation)
+        self._nav_target = None
+        self._nav_timer = QtCore.QTimer(self)
+        self._nav_timer.setSingleShot(True)
+        self._nav_timer.setInterval(0)
+        self._nav_timer.timeout.connect(self._apply_navigation)
         
         self.init_ui()
 
@@ -777,6 +1790,114 @@ class AnnotationTool(QtWidgets.QWidget):
         mgr = ToastManager.instance()
         if mgr:
             mgr.show(text, kind=kind, duration_ms=dur_ms)
+
+    # Left-panel buttons:
+    # (attribute, text, text if the icon is missing, icon names, tooltip, slot[, fallback icon])
+    _HELP_BUTTON = (
+        "help_btn", " Help / Instructions", " Help / Instructions",
+        ("question.png", "help.png", "icons/question.png"),
+        "View keyboard shortcuts and usage instructions", "show_help",
+    )
+    _FOLDER_BUTTONS = (
+        ("browse_btn", " Open Image Folder", " Open Image Folder",
+         ("folder.png", "icons/folder.png"),
+         "Load only image files from a folder (without annotations)", "browse_folder",
+         _system_folder_icon),
+        ("browse_with_annotations_btn", " Open Folder with Images & Annotations",
+         " Open Folder with Images & Annotations",
+         ("folder-annotations.png", "folder.png", "icons/folder.png"),
+         "Load both images and their annotation files from a folder", "load_folder_with_annotations",
+         _system_folder_icon),
+    )
+    _ACTION_BUTTONS = (
+        ("finish_polygon_btn", "Finish Polygon", "Finish Polygon",
+         ("Finish.png", "finish.png", "icons/finish.png"),
+         "Complete the current polygon (Right-click also works)", "finish_polygon"),
+        ("clear_btn", "Clear Annotations", "Clear Annotations",
+         ("clear.png", "trash.png", "icons/clear.png"),
+         "Remove all annotations from the current image", "clear_annotations"),
+        ("edit_label_btn", " Edit Label", " Edit Label",
+         ("edit-image.png", "edit.png", "icons/edit.png"),
+         "Edit selected annotation label (E)", "edit_selected_label"),
+        ("delete_btn", " Delete Selected", " Delete Selected",
+         ("delete.png", "trash.png", "icons/delete.png"),
+         "Delete selected annotation (Delete or Ctrl+D)", "delete_selected"),
+        ("copy_btn", " Copy", " Copy",
+         ("copy.png", "icons/copy.png"),
+         "Copy selected annotation (Ctrl+C)", "copy_selected"),
+        ("paste_btn", " Paste", " Paste",
+         ("paste.png", "icons/paste.png"),
+         "Paste copied annotation (Ctrl+V)", "paste_shape"),
+    )
+    _ZOOM_BUTTONS = (
+        ("zoom_in_btn", "Zoom In", "Zoom In",
+         ("Zoomin.png", "zoom-in.png", "icons/zoom-in.png"),
+         "Zoom in on the image (Ctrl+Mouse Wheel Up)", "zoom_in"),
+        ("zoom_out_btn", "Zoom Out", "Zoom Out",
+         ("Zoomout.png", "zoom-out.png", "icons/zoom-out.png"),
+         "Zoom out on the image (Ctrl+Mouse Wheel Down)", "zoom_out"),
+        ("fit_btn", "Window", "Window",
+         ("window.png", "fit.png", "icons/window.png"),
+         "Fit image to window size", "fit_to_window"),
+    )
+    _NAV_BUTTONS = (
+        ("prev_btn", " Previous", " Previous",
+         ("back.png", "prev.png", "icons/back.png"),
+         "Go to previous image (A or Left Arrow)", "prev_image"),
+        ("next_btn", "Next", "Next ➡",
+         ("image.png", "next.png", "icons/next.png"),
+         "Go to next image (D or Right Arrow)", "next_image"),
+    )
+    _SAVE_BUTTONS = (
+        ("save_current_btn", "Save Current", "💾 Save Current",
+         ("save.png", "icons/save.png"),
+         "Save annotations for current image only", "save_current"),
+        ("save_all_btn", "Final Save & Verify", "✅ Final Save & Verify",
+         ("save.png", "check.png", "icons/save.png"),
+         "Review all annotations before final export to new folder", "save_all"),
+        ("overwrite_btn", " Overwrite Existing Files", " Overwrite Existing Files",
+         ("overwrite.png", "refresh.png", "icons/overwrite.png"),
+         "Overwrite existing annotation files in current folder", "save_and_overwrite"),
+    )
+
+    def _make_button(self, attr, text, fallback_text, icon_names, tooltip, slot, fallback_icon=None):
+        """Build one left-panel button from a spec tuple and store it as self.<attr>."""
+        btn = QtWidgets.QPushButton(text)
+        self._queue_btn_icon(btn, fallback_text, *icon_names, fallback_icon=fallback_icon)
+        btn.setToolTip(tooltip)
+        btn.clicked.connect(getattr(self, slot))
+        setattr(self, attr, btn)
+        return btn
+
+    def _queue_btn_icon(self, btn, fallback_text, *names, fallback_icon=None):
+        """
+        Like set_btn_icon, but the QIcon is only built once the window is shown.
+        Missing assets get `fallback_icon()` if given, else their fallback
+        text, right away.
+        """
+        p = find_asset(*names)
+        if p:
+            self._pending_icons.append((btn, str(p)))
+        elif fallback_icon is not None:
+            btn.setIcon(fallback_icon())
+        else:
+            btn.setText(fallback_text)
+
+    def _load_pending_icons(self):
+        pending, self._pending_icons = self._pending_icons, []
+        dpr = self.devicePixelRatioF()
+        for btn, path in pending:
+            # Rasterize once at the button's icon size, not on every repaint
+            pm = _icon_pixmap(path, btn.iconSize(), dpr)
+            if pm is not None:
+                btn.setIcon(QtGui.QIcon(pm))
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._pending_icons:
+            # Let the first frame paint with text labels, then fill in icons
+            QtCore.QTimer.singleShot(0, self._load_pending_icons)
+
     def init_ui(self):
         # Create main layout (no central widget for QWidget)
         main_layout = QtWidgets.QHBoxLayout(self)
@@ -799,32 +1920,14 @@ class AnnotationTool(QtWidgets.QWidget):
         
         
         # Help button with icon and text
-        help_btn = QtWidgets.QPushButton()
-        set_btn_icon(help_btn, "Help / Instructions", "question.png", "help.png", "icons/question.png")
-        help_btn.setText(" Help / Instructions")
-        help_btn.setToolTip("View keyboard shortcuts and usage instructions")
-        help_btn.clicked.connect(self.show_help)
-        left_layout.addWidget(help_btn)
+        left_layout.addWidget(self._make_button(*self._HELP_BUTTON))
 
         
         # Folder controls
         folder_group = QtWidgets.QGroupBox("Folder Operations")
         folder_layout = QtWidgets.QVBoxLayout(folder_group)
-        
-        self.browse_btn = QtWidgets.QPushButton()
-        set_btn_icon(self.browse_btn, "📁 Open Image Folder", "folder.png", "icons/folder.png")
-        self.browse_btn.setText(" Open Image Folder")
-        self.browse_btn.setToolTip("Load only image files from a folder (without annotations)")
-        self.browse_btn.clicked.connect(self.browse_folder)
-        folder_layout.addWidget(self.browse_btn)
-        
-        self.browse_with_annotations_btn = QtWidgets.QPushButton()
-        set_btn_icon(self.browse_with_annotations_btn, "📂 Open Folder with Images & Annotations",
-                    "folder-annotations.png", "folder.png", "icons/folder.png")
-        self.browse_with_annotations_btn.setText(" Open Folder with Images & Annotations")
-        self.browse_with_annotations_btn.setToolTip("Load both images and their annotation files from a folder")
-        self.browse_with_annotations_btn.clicked.connect(self.load_folder_with_annotations)
-        folder_layout.addWidget(self.browse_with_annotations_btn)
+        for spec in self._FOLDER_BUTTONS:
+            folder_layout.addWidget(self._make_button(*spec))
         
         self.annotated_count_label = QtWidgets.QLabel("Annotated: 0/0")
         folder_layout.addWidget(self.annotated_count_label)
@@ -854,48 +1957,10 @@ class AnnotationTool(QtWidgets.QWidget):
         
         annotate_layout.addLayout(label_layout)
         
-        # Annotation actions in a grid layout
+        # Annotation actions in a two-column grid
         action_grid = QtWidgets.QGridLayout()
-        
-        self.finish_polygon_btn = QtWidgets.QPushButton("Finish Polygon")
-        set_btn_icon(self.finish_polygon_btn, "Finish Polygon", "Finish.png", "finish.png", "icons/finish.png")
-        self.finish_polygon_btn.setToolTip("Complete the current polygon (Right-click also works)")
-        self.finish_polygon_btn.clicked.connect(self.finish_polygon)
-        action_grid.addWidget(self.finish_polygon_btn, 0, 0)
-        
-        self.clear_btn = QtWidgets.QPushButton("Clear Annotations")
-        set_btn_icon(self.clear_btn, "Clear Annotations", "clear.png", "trash.png", "icons/clear.png")
-        self.clear_btn.setToolTip("Remove all annotations from the current image")
-        self.clear_btn.clicked.connect(self.clear_annotations)
-        action_grid.addWidget(self.clear_btn, 0, 1)
-        
-        self.edit_label_btn = QtWidgets.QPushButton()
-        set_btn_icon(self.edit_label_btn, "✏️ Edit Label", "edit-image.png", "edit.png", "icons/edit.png")
-        self.edit_label_btn.setText(" Edit Label")
-        self.edit_label_btn.clicked.connect(self.edit_selected_label)
-        self.edit_label_btn.setToolTip("Edit selected annotation label (E)")
-        action_grid.addWidget(self.edit_label_btn, 1, 0)
-        
-        self.delete_btn = QtWidgets.QPushButton()
-        set_btn_icon(self.delete_btn, "🗑️ Delete Selected", "delete.png", "trash.png", "icons/delete.png")
-        self.delete_btn.setText(" Delete Selected")
-        self.delete_btn.setToolTip("Delete selected annotation (Delete or Ctrl+D)")
-        self.delete_btn.clicked.connect(self.delete_selected)
-        action_grid.addWidget(self.delete_btn, 1, 1)
-        
-        self.copy_btn = QtWidgets.QPushButton()
-        set_btn_icon(self.copy_btn, "📋 Copy", "copy.png", "icons/copy.png")
-        self.copy_btn.setText(" Copy")
-        self.copy_btn.setToolTip("Copy selected annotation (Ctrl+C)")
-        self.copy_btn.clicked.connect(self.copy_selected)
-        action_grid.addWidget(self.copy_btn, 2, 0)
-
-        self.paste_btn = QtWidgets.QPushButton()
-        set_btn_icon(self.paste_btn, "📎 Paste", "paste.png", "icons/paste.png")
-        self.paste_btn.setText(" Paste")
-        self.paste_btn.setToolTip("Paste copied annotation (Ctrl+V)")
-        self.paste_btn.clicked.connect(self.paste_shape)
-        action_grid.addWidget(self.paste_btn, 2, 1)
+        for i, spec in enumerate(self._ACTION_BUTTONS):
+            action_grid.addWidget(self._make_button(*spec), i // 2, i % 2)
         
         annotate_layout.addLayout(action_grid)
         
@@ -904,68 +1969,24 @@ class AnnotationTool(QtWidgets.QWidget):
         # Zoom controls
         zoom_group = QtWidgets.QGroupBox("Zoom Tools")
         zoom_layout = QtWidgets.QHBoxLayout(zoom_group)
-        
-        self.zoom_in_btn = QtWidgets.QPushButton("Zoom In")
-        set_btn_icon(self.zoom_in_btn, "Zoom In", "Zoomin.png", "zoom-in.png", "icons/zoom-in.png")
-        self.zoom_in_btn.setToolTip("Zoom in on the image (Ctrl+Mouse Wheel Up)")
-        self.zoom_in_btn.clicked.connect(self.zoom_in)
-        zoom_layout.addWidget(self.zoom_in_btn)
-        
-        self.zoom_out_btn = QtWidgets.QPushButton("Zoom Out")
-        set_btn_icon(self.zoom_out_btn, "Zoom Out", "Zoomout.png", "zoom-out.png", "icons/zoom-out.png")
-        self.zoom_out_btn.setToolTip("Zoom out on the image (Ctrl+Mouse Wheel Down)")
-        self.zoom_out_btn.clicked.connect(self.zoom_out)
-        zoom_layout.addWidget(self.zoom_out_btn)
-        
-        self.fit_btn = QtWidgets.QPushButton("Window")
-        set_btn_icon(self.fit_btn, "Window", "window.png", "fit.png", "icons/window.png")
-        self.fit_btn.clicked.connect(self.fit_to_window)
-        self.fit_btn.setToolTip("Fit image to window size")
-        zoom_layout.addWidget(self.fit_btn)
+        for spec in self._ZOOM_BUTTONS:
+            zoom_layout.addWidget(self._make_button(*spec))
         
         left_layout.addWidget(zoom_group)
         
         # Navigation controls
         nav_group = QtWidgets.QGroupBox("Navigation")
         nav_layout = QtWidgets.QHBoxLayout(nav_group)
-
-        self.prev_btn = QtWidgets.QPushButton()
-        set_btn_icon(self.prev_btn, "⬅ Previous", "back.png", "prev.png", "icons/back.png")
-        self.prev_btn.setText(" Previous")
-        self.prev_btn.setToolTip("Go to previous image (A or Left Arrow)")
-        self.prev_btn.clicked.connect(self.prev_image)
-        nav_layout.addWidget(self.prev_btn)
-
-        self.next_btn = QtWidgets.QPushButton("Next")
-        set_btn_icon(self.next_btn, "Next ➡", "image.png", "next.png", "icons/next.png")
-        self.next_btn.setToolTip("Go to next image (D or Right Arrow)")
-        self.next_btn.clicked.connect(self.next_image)
-        nav_layout.addWidget(self.next_btn)
+        for spec in self._NAV_BUTTONS:
+            nav_layout.addWidget(self._make_button(*spec))
         
         left_layout.addWidget(nav_group)
         
         # Save controls
         save_group = QtWidgets.QGroupBox("Save Operations")
         save_layout = QtWidgets.QVBoxLayout(save_group)
-
-        self.save_current_btn = QtWidgets.QPushButton("Save Current")
-        set_btn_icon(self.save_current_btn, "💾 Save Current", "save.png", "icons/save.png")
-        self.save_current_btn.setToolTip("Save annotations for current image only")
-        self.save_current_btn.clicked.connect(self.save_current)
-        save_layout.addWidget(self.save_current_btn)
-
-        self.save_all_btn = QtWidgets.QPushButton("Final Save & Verify")
-        set_btn_icon(self.save_all_btn, "✅ Final Save & Verify", "save.png", "check.png", "icons/save.png")
-        self.save_all_btn.setToolTip("Review all annotations before final export to new folder")
-        self.save_all_btn.clicked.connect(self.save_all)
-        save_layout.addWidget(self.save_all_btn)
-
-        self.overwrite_btn = QtWidgets.QPushButton()
-        set_btn_icon(self.overwrite_btn, "🔄 Overwrite Existing Files", "overwrite.png", "refresh.png", "icons/overwrite.png")
-        self.overwrite_btn.setText(" Overwrite Existing Files")
-        self.overwrite_btn.clicked.connect(self.save_and_overwrite)
-        self.overwrite_btn.setToolTip("Overwrite existing annotation files in current folder")
-        save_layout.addWidget(self.overwrite_btn)
+        for spec in self._SAVE_BUTTONS:
+            save_layout.addWidget(self._make_button(*spec))
 
         left_layout.addWidget(save_group)
         
@@ -1005,7 +2026,7 @@ class AnnotationTool(QtWidgets.QWidget):
         layout = QtWidgets.QVBoxLayout(dialog)
         
         title = QtWidgets.QLabel("Choose annotation format:")
-        title.setStyleSheet("font-weight: bold; margin: 10px;")
+        title.setStyleSheet(self._TITLE_STYLE)
         layout.addWidget(title)
         
         # Format selection
@@ -1015,6 +2036,11 @@ class AnnotationTool(QtWidgets.QWidget):
         json_radio = QtWidgets.QRadioButton("JSON (LabelMe format)")
         xml_radio = QtWidgets.QRadioButton("XML (Pascal VOC format)")
         json_radio.setChecked(True)  # Default to JSON
+
+        # Read the choice once on accept instead of tracking every toggle
+        format_buttons = QtWidgets.QButtonGroup(dialog)
+        format_buttons.addButton(json_radio, 0)
+        format_buttons.addButton(xml_radio, 1)
         
         format_layout.addWidget(json_radio)
         format_layout.addWidget(xml_radio)
@@ -1030,40 +2056,72 @@ class AnnotationTool(QtWidgets.QWidget):
         button_layout.addWidget(btn_cancel)
         layout.addLayout(button_layout)
         
-        # Store selected format
-        selected_format = "json"
-        
-        def on_json_toggled(checked):
-            nonlocal selected_format
-            if checked:
-                selected_format = "json"
-        
-        def on_xml_toggled(checked):
-            nonlocal selected_format
-            if checked:
-                selected_format = "xml"
-        
-        json_radio.toggled.connect(on_json_toggled)
-        xml_radio.toggled.connect(on_xml_toggled)
-        
         btn_ok.clicked.connect(dialog.accept)
         btn_cancel.clicked.connect(dialog.reject)
         
         result = dialog.exec_()
         
         if result == QtWidgets.QDialog.Accepted:
-            return selected_format
+            return "xml" if format_buttons.checkedId() == 1 else "json"
         else:
             return None
 
-    def convert_annotations_to_xml_format(self, img_path, annotations):
+    # Pascal VOC layout written by convert_annotations_to_xml_format
+    _VOC_HEADER = (
+        '<?xml version="1.0" ?>\n'
+        "<annotation>\n"
+        "\t<folder>{folder}</folder>\n"
+        "\t<filename>{filename}</filename>\n"
+        "\t<path>{path}</path>\n"
+        "\t<source>\n"
+        "\t\t<database>Unknown</database>\n"
+        "\t</source>\n"
+        "\t<size>\n"
+        "\t\t<width>{width}</width>\n"
+        "\t\t<height>{height}</height>\n"
+        "\t\t<depth>{depth}</depth>\n"
+        "\t</size>\n"
+        "\t<segmented>0</segmented>\n"
+    )
+    _VOC_OBJECT = (
+        "\t<object>\n"
+        "\t\t<name>{name}</name>\n"
+        "\t\t<pose>Unspecified</pose>\n"
+        "\t\t<truncated>0</truncated>\n"
+        "\t\t<difficult>0</difficult>\n"
+        "\t\t<bndbox>\n"
+        "\t\t\t<xmin>{xmin}</xmin>\n"
+        "\t\t\t<ymin>{ymin}</ymin>\n"
+        "\t\t\t<xmax>{xmax}</xmax>\n"
+        "\t\t\t<ymax>{ymax}</ymax>\n"
+        "\t\t</bndbox>\n"
+        "\t</object>\n"
+    )
+
+    def image_size(self, img_path):
+        """
+        (width, height) of the image file, read from its header only. Falls back
+        to the canvas when the header can't be read but that image is loaded
+        (GUI thread only; export workers call this too).
+        """
+        size = QtGui.QImageReader(img_path).size()
+        if size.isValid():
+            return size.width(), size.height()
+        pm = self.canvas.original_pixmap
+        if pm and img_path == self.current_image and QtCore.QThread.currentThread() is self.thread():
+            return pm.width(), pm.height()
+        return None
+
+    def convert_annotations_to_xml_format(self, img_path, annotations, image_size=None):
         """Convert annotations to Pascal VOC XML format"""
-        if not self.canvas.original_pixmap:
+        # Dimensions of img_path itself, not of whatever the canvas shows
+        if image_size is None:
+            image_size = self.image_size(img_path)
+        if image_size is None:
             return None
         
         # Get image dimensions
-        width = self.canvas.original_pixmap.width()
-        height = self.canvas.original_pixmap.height()
+        width, height = image_size
         depth = 3  # Assuming RGB images
         
         # Get folder and filename
@@ -1071,248 +2129,94 @@ class AnnotationTool(QtWidgets.QWidget):
         file_name = os.path.basename(img_path)
         full_path = os.path.abspath(img_path)
         
-        # Create XML structure
-        import xml.etree.ElementTree as ET
-        from xml.dom import minidom
-        
-        # Create root element
-        annotation = ET.Element("annotation")
-        
-        # Folder
-        folder_elem = ET.SubElement(annotation, "folder")
-        folder_elem.text = folder_name
-        
-        # Filename
-        filename_elem = ET.SubElement(annotation, "filename")
-        filename_elem.text = file_name
-        
-        # Path
-        path_elem = ET.SubElement(annotation, "path")
-        path_elem.text = full_path
-        
-        # Source
-        source_elem = ET.SubElement(annotation, "source")
-        database_elem = ET.SubElement(source_elem, "database")
-        database_elem.text = "Unknown"
-        
-        # Size
-        size_elem = ET.SubElement(annotation, "size")
-        width_elem = ET.SubElement(size_elem, "width")
-        width_elem.text = str(width)
-        height_elem = ET.SubElement(size_elem, "height")
-        height_elem.text = str(height)
-        depth_elem = ET.SubElement(size_elem, "depth")
-        depth_elem.text = str(depth)
-        
-        # Segmented
-        segmented_elem = ET.SubElement(annotation, "segmented")
-        segmented_elem.text = "0"
-        
         # Objects
-        for ann in annotations:
-            if ann['shape'] == 'rectangle':
-                points = ann['points']
-                if len(points) >= 2:
-                    # Extract coordinates
-                    x_coords = [point[0] for point in points]
-                    y_coords = [point[1] for point in points]
-                    
-                    xmin = int(min(x_coords))
-                    ymin = int(min(y_coords))
-                    xmax = int(max(x_coords))
-                    ymax = int(max(y_coords))
-                    
-                    # Create object element
-                    object_elem = ET.SubElement(annotation, "object")
-                    
-                    # Name
-                    name_elem = ET.SubElement(object_elem, "name")
-                    name_elem.text = ann['label']
-                    
-                    # Pose
-                    pose_elem = ET.SubElement(object_elem, "pose")
-                    pose_elem.text = "Unspecified"
-                    
-                    # Truncated
-                    truncated_elem = ET.SubElement(object_elem, "truncated")
-                    truncated_elem.text = "0"
-                    
-                    # Difficult
-                    difficult_elem = ET.SubElement(object_elem, "difficult")
-                    difficult_elem.text = "0"
-                    
-                    # Bounding box
-                    bndbox_elem = ET.SubElement(object_elem, "bndbox")
-                    xmin_elem = ET.SubElement(bndbox_elem, "xmin")
-                    xmin_elem.text = str(xmin)
-                    ymin_elem = ET.SubElement(bndbox_elem, "ymin")
-                    ymin_elem.text = str(ymin)
-                    xmax_elem = ET.SubElement(bndbox_elem, "xmax")
-                    xmax_elem.text = str(xmax)
-                    ymax_elem = ET.SubElement(bndbox_elem, "ymax")
-                    ymax_elem.text = str(ymax)
-        
-        # Convert to pretty XML string
-        rough_string = ET.tostring(annotation, 'utf-8')
-        reparsed = minidom.parseString(rough_string)
-        pretty_xml = reparsed.toprettyxml(indent="\t")
-        
-        return pretty_xml
-    
-    def save_annotations_as_xml(self, img_path, output_folder, overwrite=False):
-        """Save annotations as XML file in Pascal VOC format"""
-        if img_path not in self.annotations or not self.annotations[img_path]:
-            return False
-        
-        try:
-            base_name = os.path.splitext(os.path.basename(img_path))[0]
-            
-            if overwrite:
-                # Save directly in current folder
-                xml_path = os.path.join(self.folder, f"{base_name}.xml")
-            else:
-                # Save in annotations folder
-                xml_path = os.path.join(output_folder, f"{base_name}.xml")
-            
-            # Convert annotations to XML format
-            xml_content = self.convert_annotations_to_xml_format(img_path, self.annotations[img_path])
-            
-            if xml_content:
-                with open(xml_path, 'w', encoding='utf-8') as f:
-                    f.write(xml_content)
-                
-                print(f"Saved XML annotations: {xml_path}")
-                return True
-        
-        except Exception as e:
-            print(f"Error saving XML for {img_path}: {e}")
-            return False
-        
-        return False
-
-    def show_help(self):
-        help_text = """
-            <h2>Annotation Tool - User Guide</h2>
-
-            <h3>📁 Getting Started</h3>
-            <ul>
-            <li>Click <b>'Open Image Folder'</b> to load images for annotation</li>
-            <li>Click <b>'Open Folder with Images & Annotations'</b> to load both images and their annotation files</li>
-            <li>Images will appear as thumbnails at the bottom</li>
-            <li>Click any thumbnail to select an image</li>
-            </ul>
-
-            <h3>🎯 Annotation Tools</h3>
-            <ul>
-            <li><b>Rectangle Tool (R):</b> Click and drag to create bounding boxes</li>
-            <li><b>Polygon Tool (P):</b> Click to place points, right-click or use 'Finish Polygon' to complete</li>
-            <li><b>Select Tool (S):</b> Click and drag to move annotations, drag corners to resize</li>
-            </ul>
-
-            <h3>🔧 Basic Operations</h3>
-            <ul>
-            <li><b>Enter Label:</b> Type the object label before annotating</li>
-            <li><b>Label Selection:</b> Click the 📋 button to select from existing labels</li>
-            <li><b>Clear All:</b> Remove all annotations from current image</li>
-            <li><b>Navigation:</b> Use Previous/Next buttons (A/D keys) or click thumbnails</li>
-            </ul>
-
-            <h3>🔄 Annotation Editing</h3>
-            <ul>
-            <li><b>Auto-Label Editor:</b> Label selection opens automatically after creating annotations</li>
-            <li><b>Edit Label (E):</b> Modify selected annotation's label</li>
-            <li><b>Copy (Ctrl+C):</b> Copy selected annotation</li>
-            <li><b>Paste (Ctrl+V):</b> Paste copied annotation</li>
-            <li><b>Delete Selected (Delete/Ctrl+D):</b> Remove currently selected annotation</li>
-            <li><b>Click and Drag:</b> Move annotations or resize using handles</li>
-            </ul>
-
-            <h3>↩️ Undo/Redo</h3>
-            <ul>
-            <li><b>Undo (Ctrl+Z):</b> Reverse last action</li>
-            <li><b>Redo (Ctrl+Y):</b> Restore undone action</li>
-            </ul>
-
-            <h3>🔍 Zoom & View</h3>
-            <ul>
-            <li><b>Zoom In/Out:</b> Use buttons or Ctrl+Mouse Wheel</li>
-            <li><b>Fit to Window:</b> Auto-adjust image to window size</li>
-            <li><b>Pan:</b> Use scrollbars when zoomed in</li>
-            </ul>
-
-            <h3>💾 Saving Annotations</h3>
-            <ul>
-            <li><b>Auto-Save:</b> Annotations are automatically saved in memory</li>
-            <li><b>Save Current:</b> Save annotations for current image only (choose JSON or XML format)</li>
-            <li><b>Overwrite Existing Files:</b> Update annotation files in current folder (choose JSON or XML format)</li>
-            <li><b>Final Save & Verify:</b> Review all annotations before export to new folder (choose JSON or XML format)</li>
-            <li><b>Format Selection:</b> When saving, you can choose between JSON or XML format</li>
-            <li><b>JSON Format:</b> LabelMe compatible format with image data and annotations</li>
-            <li><b>XML Format:</b> Pascal VOC format compatible with popular object detection frameworks</li>
-            </ul>
-
-            <h3>🎨 Interface Features</h3>
-            <ul>
-            <li>Different colors for different labels</li>
-            <li>Real-time annotation display</li>
-            <li>Progress tracking with auto-save status</li>
-            <li>Visual indicators for annotated images in thumbnails</li>
-            <li>Dark theme for comfortable usage</li>
-            <li>Tooltips on all buttons for quick guidance</li>
-            <li>Format selection dialog for flexible export options</li>
-            </ul>
-
-            <h3>⚡ Keyboard Shortcuts</h3>
-            <ul>
-            <li><b>A / Left Arrow:</b> Previous image</li>
-            <li><b>D / Right Arrow:</b> Next image</li>
-            <li><b>R:</b> Rectangle tool</li>
-            <li><b>P:</b> Polygon tool</li>
-            <li><b>S:</b> Select tool</li>
-            <li><b>E:</b> Edit selected annotation label</li>
-            <li><b>Delete / Ctrl+D:</b> Delete selected annotation</li>
-            <li><b>Ctrl+C:</b> Copy selected annotation</li>
-            <li><b>Ctrl+V:</b> Paste annotation</li>
-            <li><b>Ctrl+Z:</b> Undo</li>
-            <li><b>Ctrl+Y:</b> Redo</li>
-            <li><b>Escape:</b> Cancel current operation</li>
-            <li><b>Ctrl + Mouse Wheel:</b> Zoom in/out</li>
-            <li><b>Right-click:</b> Finish polygon (when using polygon tool)</li>
-            </ul>
+        objects = []
+        for ann in annotations:
+            if ann['shape'] == 'rectangle':
+                points = ann['points']
+                if len(points) == 2:
+                    # Two corners: order them directly, no temporary lists
+                    (x0, y0), (x1, y1) = points
+                    xmin, xmax = (x0, x1) if x0 < x1 else (x1, x0)
+                    ymin, ymax = (y0, y1) if y0 < y1 else (y1, y0)
+                elif len(points) > 2:
+                    x_coords = [point[0] for point in points]
+                    y_coords = [point[1] for point in points]
+                    xmin, xmax = min(x_coords), max(x_coords)
+                    ymin, ymax = min(y_coords), max(y_coords)
+                else:
+                    continue
 
-            <h3>📊 JSON Export Format</h3>
-            <ul>
-            <li><b>imagePath:</b> Full path to the image</li>
-            <li><b>imageName:</b> Just the filename</li>
-            <li><b>imageData:</b> Base64 encoded image data</li>
-            <li><b>imageWidth / imageHeight:</b> Image dimensions</li>
-            <li><b>annotations:</b> All annotation data with labels and coordinates</li>
-            <li><b>exportTime / updatedTime:</b> Timestamps</li>
-            <li><b>Compatible with:</b> LabelMe and custom annotation pipelines</li>
-            </ul>
+                objects.append(self._VOC_OBJECT.format(
+                    name=xml_escape(ann['label']),
+                    xmin=int(xmin), ymin=int(ymin), xmax=int(xmax), ymax=int(ymax),
+                ))
+        
+        # The VOC schema is fixed, so fill a template rather than build a DOM
+        header = self._VOC_HEADER.format(
+            folder=xml_escape(folder_name),
+            filename=xml_escape(file_name),
+            path=xml_escape(full_path),
+            width=width, height=height, depth=depth,
+        )
+        return header + "".join(objects) + "</annotation>\n"
+    
+    def save_annotations_as_xml(self, img_path, output_folder, overwrite=False):
+        """Save annotations as XML file in Pascal VOC format"""
+        anns = self.annotations.get(img_path)
+        if not anns:
+            return False
+        image_size = self.image_size(img_path)
+        if image_size is None:
+            # No image dimensions to write the annotations with
+            return False
+        
+        try:
+            # Overwrite saves next to the images, otherwise in the annotations folder
+            out_dir = Path(self.folder if overwrite else output_folder)
+            xml_path = out_dir / f"{Path(img_path).stem}.xml"
+            
+            # Reuse the XML from the last save of this image if nothing changed
+            # (Save Current -> Overwrite -> Final Save all export the same data)
+            fingerprint = (image_size, tuple(
+                (a['shape'], a['label'], tuple(map(tuple, a['points']))) for a in anns
+            ))
+            cached = self._xml_cache.get(img_path)
+            if cached is not None and cached[0] == fingerprint:
+                xml_content = cached[1]
+            else:
+                xml_content = self.convert_annotations_to_xml_format(img_path, anns, image_size)
+                self._xml_cache[img_path] = (fingerprint, xml_content)
+            
+            if xml_content:
+                xml_path.write_text(xml_content, encoding="utf-8")
+                
+                log.debug("Saved XML annotations: %s", xml_path)
+                return True
+        
+        except Exception as e:
+            log.warning("Error saving XML for %s: %s", img_path, e)
+            return False
+        
+        return False
 
-            <h3>📄 XML Export Format (Pascal VOC)</h3>
-            <ul>
-            <li><b>&lt;folder&gt;:</b> Name of the folder containing the image</li>
-            <li><b>&lt;filename&gt;:</b> Name of the image file</li>
-            <li><b>&lt;path&gt;:</b> Full path to the image file</li>
-            <li><b>&lt;size&gt;:</b> Image dimensions (width, height, depth)</li>
-            <li><b>&lt;object&gt;:</b> Each annotation as a separate object</li>
-            <li><b>&lt;name&gt;:</b> Label name for the object</li>
-            <li><b>&lt;bndbox&gt;:</b> Bounding box coordinates (xmin, ymin, xmax, ymax)</li>
-            <li><b>&lt;pose&gt;, &lt;truncated&gt;, &lt;difficult&gt;:</b> Standard Pascal VOC attributes</li>
-            <li><b>Compatible with:</b> Popular object detection frameworks like YOLO, Faster R-CNN, SSD</li>
-            </ul>
+    def help_document(self):
+        """The user guide parsed into a QTextDocument once, shared by every help dialog"""
+        doc = getattr(self, "_help_doc", None)
+        if doc is None:
+            # Parented to the tool so it outlives each dialog's text browser
+            doc = self._help_doc = QtGui.QTextDocument(self)
+            doc.setHtml(self._HELP_HTML)
+        return doc
 
-            <h3>🔄 Format Comparison</h3>
-            <ul>
-            <li><b>JSON:</b> Better for web applications, includes image data, smaller file size</li>
-            <li><b>XML:</b> Industry standard for object detection, compatible with most ML frameworks</li>
-            <li><b>Both formats</b> contain the same annotation information</li>
-            <li>You can export in both formats for different use cases</li>
-            </ul>
-            """
-        
+    def show_help(self):
+        # Built on first use and kept, later clicks just show it again
+        dialog = getattr(self, "_help_dialog", None)
+        if dialog is None:
+            dialog = self._help_dialog = self._build_help_dialog()
+        dialog.exec_()
+
+    def _build_help_dialog(self):
         # Create a custom dialog with scrollable text
         dialog = QtWidgets.QDialog(self)
         dialog.setWindowTitle("Help - Annotation Tool User Guide")
@@ -1334,7 +2238,7 @@ class AnnotationTool(QtWidgets.QWidget):
         
         # Create text browser for HTML content
         text_browser = QtWidgets.QTextBrowser()
-        text_browser.setHtml(help_text)
+        text_browser.setDocument(self.help_document())
         text_browser.setOpenExternalLinks(False)
         text_browser.setReadOnly(True)
         
@@ -1352,8 +2256,8 @@ class AnnotationTool(QtWidgets.QWidget):
         button_box.accepted.connect(dialog.accept)
         layout.addWidget(button_box)
         
-        # Show dialog
-        dialog.exec_()
+        return dialog
+
     def browse_folder(self):
         folder = QtWidgets.QFileDialog.getExistingDirectory(self, "Select Image Folder")
         if folder:
@@ -1361,16 +2265,16 @@ class AnnotationTool(QtWidgets.QWidget):
                 
     def load_folder(self, folder):
         self.folder = folder
-        exts = (".jpg", ".jpeg", ".png", ".bmp", ".tiff", ".tif", ".webp")
-        self.images = sorted([os.path.join(folder, f) for f in os.listdir(folder) 
-                            if f.lower().endswith(exts)])
+        self._xml_cache.clear()
+        self._thumb_cache.clear()
+        self.images, json_files = scan_folder(folder)
         
         if self.images:
             self.thumbnail_list.load_images(self.images)
             self.current_index = 0
             
             # Auto-load any existing annotations in the folder
-            self.auto_load_existing_annotations()
+            self.auto_load_existing_annotations(json_files)
             
             self.load_current_image()
             self.update_annotated_count()
@@ -1378,51 +2282,69 @@ class AnnotationTool(QtWidgets.QWidget):
         else:
             self.toast("No images found in the selected folder.", "warning", 2500)
 
-    def auto_load_existing_annotations(self):
+    def auto_load_existing_annotations(self, json_files=None):
         """Automatically load existing annotations when opening a folder"""
+        if json_files is None:
+            json_files = scan_folder(self.folder)[1]
+        # Match names the way the filesystem would (case-insensitive on Windows)
+        json_by_name = {os.path.normcase(f): f for f in json_files}
+
+        # Candidate JSONs per image, in the order they are tried
+        candidates = []
         for img_path in self.images:
             img_base_name = os.path.splitext(os.path.basename(img_path))[0]
             
-            # Look for JSON files with same base name
-            possible_json_names = [
+            # Look for JSON files with same base name; the case variants often
+            # coincide, so each distinct file is only tried once
+            possible_json_names = dict.fromkeys(os.path.normcase(name) for name in (
                 f"{img_base_name}.json",
                 f"{img_base_name.lower()}.json",
                 f"{img_base_name.upper()}.json"
-            ]
-            
-            for json_name in possible_json_names:
-                json_path = os.path.join(self.folder, json_name)
-                if os.path.exists(json_path):
-                    try:
-                        with open(json_path, 'r') as f:
-                            data = json.load(f)
-                            
-                            # Handle both LabelMe format and legacy custom format
-                            annotations = []
-                            
-                            # LabelMe format
-                            if 'shapes' in data:
-                                shapes = data.get('shapes', [])
-                                for shape in shapes:
-                                    annotation = {
-                                        'label': shape.get('label', 'unknown'),
-                                        'shape': shape.get('shape_type', 'polygon'),
-                                        'points': shape.get('points', [])
-                                    }
-                                    annotations.append(annotation)
-                            # Legacy custom format (for backward compatibility)
-                            elif 'annotations' in data:
-                                annotations = data.get('annotations', [])
-                            
-                            if annotations:
-                                self.annotations[img_path] = annotations
-                                
-                                # Extract labels
-                                for ann in annotations:
-                                    self.existing_labels.add(ann['label'])
-                                break  # Found annotations, no need to check other names
-                    except Exception as e:
-                        print(f"Error auto-loading annotations from {json_path}: {e}")
+            ))
+            
+            json_paths = [os.path.join(self.folder, json_by_name[name])
+                          for name in possible_json_names if name in json_by_name]
+            if json_paths:
+                candidates.append((img_path, json_paths))
+
+        # Parse every candidate file up front, in parallel
+        all_paths = list(dict.fromkeys(p for _, paths in candidates for p in paths))
+        parsed = dict(zip(all_paths, load_annotation_jsons(all_paths)))
+
+        for img_path, json_paths in candidates:
+            for json_path in json_paths:
+                try:
+                    data = parsed[json_path]
+                    if isinstance(data, Exception):
+                        raise data
+                    
+                    # Handle both LabelMe format and legacy custom format
+                    annotations = []
+                    
+                    # LabelMe format
+                    if 'shapes' in data:
+                        shapes = data.get('shapes', [])
+                        for shape in shapes:
+                            annotation = {
+                                'label': intern_label(shape.get('label', 'unknown')),
+                                'shape': shape.get('shape_type', 'polygon'),
+                                'points': annotation_points(shape.get('points', []))
+                            }
+                            annotations.append(annotation)
+                    # Legacy custom format (for backward compatibility)
+                    elif 'annotations' in data:
+                        annotations = data.get('annotations', [])
+                    
+                    if annotations:
+                        self.annotations[img_path] = annotations
+                        
+                        # Extract labels (legacy entries are interned here too)
+                        for ann in annotations:
+                            ann['label'] = intern_label(ann['label'])
+                            self._add_label(ann['label'])
+                        break  # Found annotations, no need to check other names
+                except Exception as e:
+                    log.warning("Error auto-loading annotations from %s: %s", json_path, e)
 
     def load_folder_with_annotations(self):
         """Load a folder that contains both images and annotation JSON files"""
@@ -1432,11 +2354,11 @@ class AnnotationTool(QtWidgets.QWidget):
             self.images = []
             self.annotations = {}
             self.existing_labels.clear()
+            self._sorted_labels_cache = None
+            self._thumb_cache.clear()
             
-            # Find all image files
-            exts = (".jpg", ".jpeg", ".png", ".bmp", ".tiff", ".tif", ".webp")
-            self.images = sorted([os.path.join(folder, f) for f in os.listdir(folder) 
-                                if f.lower().endswith(exts)])
+            # Find all image and JSON files in one pass
+            self.images, json_files = scan_folder(folder)
             
             if not self.images:
                 QtWidgets.QMessageBox.warning(self, "No Images", "No image files found in the selected folder")
@@ -1447,7 +2369,7 @@ class AnnotationTool(QtWidgets.QWidget):
             self.current_index = 0
             
             # Load annotations from JSON files in the same folder
-            self.load_annotations_from_current_folder()
+            self.load_annotations_from_current_folder(json_files)
             
             self.load_current_image()
             self.update_annotated_count()
@@ -1457,7 +2379,7 @@ class AnnotationTool(QtWidgets.QWidget):
                                             f"Found annotations for {len([img for img in self.images if img in self.annotations])} images\n"
                                             f"Found {len(self.existing_labels)} unique labels")
             self.toast(f"Images: {len(self.images)} • With annotations: {len([img for img in self.images if img in self.annotations])} • Labels: {len(self.existing_labels)}", "info", 2800) 
-    def load_annotations_from_current_folder(self):
+    def load_annotations_from_current_folder(self, json_files=None):
         """Load annotations from JSON files in the current folder"""
         if not self.folder:
             return
@@ -1465,100 +2387,99 @@ class AnnotationTool(QtWidgets.QWidget):
         loaded_count = 0
         
         # Find all JSON files in the folder
-        try:
-            json_files = [f for f in os.listdir(self.folder) if f.endswith('.json')]
-        except Exception as e:
-            print(f"Error reading folder {self.folder}: {e}")
-            return
-        
-        for json_file in json_files:
-            json_path = os.path.join(self.folder, json_file)
+        if json_files is None:
             try:
-                with open(json_path, 'r') as f:
-                    data = json.load(f)
-                    
-                    # Detect JSON format and extract annotations accordingly
-                    annotations = []
-                    image_name_from_json = ""
-                    
-                    # LabelMe format (new format)
-                    if 'shapes' in data and 'imagePath' in data:
-                        shapes = data.get('shapes', [])
-                        for shape in shapes:
-                            annotation = {
-                                'label': shape.get('label', 'unknown'),
-                                'shape': shape.get('shape_type', 'polygon'),
-                                'points': shape.get('points', [])
-                            }
-                            annotations.append(annotation)
-                        image_name_from_json = data.get('imagePath', '')
-                        # Ensure we have just the filename
-                        image_name_from_json = os.path.basename(image_name_from_json)
-                        
-                    # Legacy custom format (for backward compatibility)
-                    elif 'annotations' in data and 'image_path' in data:
-                        annotations = data.get('annotations', [])
-                        image_name_from_json = data.get('image_path', '')
-                        # Ensure we have just the filename
-                        image_name_from_json = os.path.basename(image_name_from_json)
-                    
-                    else:
-                        print(f"Unknown JSON format in {json_file}")
-                        continue
-                    
-                    if not annotations:
-                        print(f"No annotations found in {json_file}")
-                        continue
-                    
-                    # Find matching image
-                    matching_image = None
-                    json_base_name = os.path.splitext(json_file)[0]
-                    
-                    # Method 1: Try filename matching with the stored image_name_from_json
-                    if image_name_from_json:
-                        for img in self.images:
-                            img_filename = os.path.basename(img)
-                            if img_filename == image_name_from_json:
-                                matching_image = img
-                                break
-                    
-                    # Method 2: Try base name matching (without extension)
-                    if not matching_image:
-                        for img in self.images:
-                            img_base_name = os.path.splitext(os.path.basename(img))[0]
-                            if img_base_name == json_base_name:
-                                matching_image = img
-                                break
-                    
-                    # Method 3: Try case-insensitive base name matching
-                    if not matching_image:
-                        for img in self.images:
-                            img_base_name = os.path.splitext(os.path.basename(img))[0]
-                            if img_base_name.lower() == json_base_name.lower():
-                                matching_image = img
-                                break
+                json_files = scan_folder(self.folder)[1]
+            except Exception as e:
+                log.warning("Error reading folder %s: %s", self.folder, e)
+                return
+
+        # Lookup tables for matching JSON files to images; setdefault keeps the
+        # first image in folder order, which is what the old linear scans found
+        by_filename, by_filename_ci, by_base, by_base_ci = {}, {}, {}, {}
+        for img in self.images:
+            img_filename = os.path.basename(img)
+            img_base_name = os.path.splitext(img_filename)[0]
+            by_filename.setdefault(img_filename, img)
+            by_filename_ci.setdefault(img_filename.lower(), img)
+            by_base.setdefault(img_base_name, img)
+            by_base_ci.setdefault(img_base_name.lower(), img)
+        
+        json_paths = [os.path.join(self.folder, f) for f in json_files]
+        parsed = load_annotation_jsons(json_paths)
+
+        for json_file, json_path, data in zip(json_files, json_paths, parsed):
+            try:
+                if isinstance(data, Exception):
+                    raise data
+                
+                # Detect JSON format and extract annotations accordingly
+                annotations = []
+                image_name_from_json = ""
+                
+                # LabelMe format (new format)
+                if 'shapes' in data and 'imagePath' in data:
+                    shapes = data.get('shapes', [])
+                    for shape in shapes:
+                        annotation = {
+                            'label': intern_label(shape.get('label', 'unknown')),
+                            'shape': shape.get('shape_type', 'polygon'),
+                            'points': annotation_points(shape.get('points', []))
+                        }
+                        annotations.append(annotation)
+                    image_name_from_json = data.get('imagePath', '')
+                    # Ensure we have just the filename
+                    image_name_from_json = os.path.basename(image_name_from_json)
                     
-                    # Method 4: Try case-insensitive filename matching with image_name_from_json
-                    if not matching_image and image_name_from_json:
-                        for img in self.images:
-                            img_filename = os.path.basename(img)
-                            if img_filename.lower() == image_name_from_json.lower():
-                                matching_image = img
-                                break
+                # Legacy custom format (for backward compatibility)
+                elif 'annotations' in data and 'image_path' in data:
+                    annotations = data.get('annotations', [])
+                    image_name_from_json = data.get('image_path', '')
+                    # Ensure we have just the filename
+                    image_name_from_json = os.path.basename(image_name_from_json)
+                
+                else:
+                    log.debug("Unknown JSON format in %s", json_file)
+                    continue
+                
+                if not annotations:
+                    log.debug("No annotations found in %s", json_file)
+                    continue
+                
+                # Find matching image
+                matching_image = None
+                json_base_name = os.path.splitext(json_file)[0]
+                
+                # Method 1: Try filename matching with the stored image_name_from_json
+                if image_name_from_json:
+                    matching_image = by_filename.get(image_name_from_json)
+                
+                # Method 2: Try base name matching (without extension)
+                if not matching_image:
+                    matching_image = by_base.get(json_base_name)
+                
+                # Method 3: Try case-insensitive base name matching
+                if not matching_image:
+                    matching_image = by_base_ci.get(json_base_name.lower())
+                
+                # Method 4: Try case-insensitive filename matching with image_name_from_json
+                if not matching_image and image_name_from_json:
+                    matching_image = by_filename_ci.get(image_name_from_json.lower())
+                
+                if matching_image:
+                    # Store annotations in memory
+                    self.annotations[matching_image] = annotations
+                    loaded_count += 1
                     
-                    if matching_image:
-                        # Store annotations in memory
-                        self.annotations[matching_image] = annotations
-                        loaded_count += 1
-                        
-                        # Extract labels
-                        for ann in annotations:
-                            self.existing_labels.add(ann['label'])
-                    else:
-                        print(f"Could not find matching image for {json_file}. Looking for: {image_name_from_json}")
+                    # Extract labels (legacy entries are interned here too)
+                    for ann in annotations:
+                        ann['label'] = intern_label(ann['label'])
+                        self._add_label(ann['label'])
+                else:
+                    log.debug("Could not find matching image for %s. Looking for: %s", json_file, image_name_from_json)
                             
             except Exception as e:
-                print(f"Error loading {json_path}: {e}")
+                log.warning("Error loading %s: %s", json_path, e)
 
     def auto_open_label_editor(self):
         """Automatically open label selection after creating an annotation"""
@@ -1574,7 +2495,7 @@ class AnnotationTool(QtWidgets.QWidget):
             current_label = self.canvas.shapes[self.canvas.selected_shape_index][2]
             
             # Directly open the full label selection dialog
-            dialog = LabelSelectionDialog(sorted(self.existing_labels), self)
+            dialog = LabelSelectionDialog(self._sorted_labels(), self)
             dialog.label_input.setText(current_label)  # Pre-fill with current label
             dialog.label_input.selectAll()  # Select text for easy editing
             
@@ -1582,7 +2503,7 @@ class AnnotationTool(QtWidgets.QWidget):
                 new_label = dialog.get_selected_label()
                 if new_label and new_label != current_label:
                     self.canvas.edit_selected_label(new_label)
-                    self.existing_labels.add(new_label)
+                    self._add_label(new_label)
                     # Update the label input field in main UI
                     self.label_input.setText(new_label)
 
@@ -1592,18 +2513,21 @@ class AnnotationTool(QtWidgets.QWidget):
             return
             
         try:
+            # Commit a debounced auto-save while current_image still matches the canvas
+            self.canvas.flush_pending_save()
+            
             # Set current image FIRST - THIS WAS MISSING
             img_path = self.images[self.current_index]
             self.current_image = img_path  # THIS FIXES THE "No current image" ERROR
             
             
-            # Load the image to canvas
-            pixmap = QtGui.QPixmap(img_path)
+            # Load the image to canvas (decoded once, reused from the pixmap cache)
+            pixmap = image_pixmap(img_path)
             if pixmap.isNull():
                 print(f"Failed to load image: {img_path}")
                 return
                 
-            self.canvas.load_image(img_path)
+            self.canvas.load_image(pixmap)
             self.canvas.setEnabled(True)
             
             # Update window title
@@ -1614,12 +2538,33 @@ class AnnotationTool(QtWidgets.QWidget):
             
             # Update thumbnail selection
             self.thumbnail_list.setCurrentRow(self.current_index)
+
+            # Most navigation is sequential: decode the neighbours while the user works
+            self.prefetch_neighbours()
             
         except Exception as e:
             print(f"Error loading current image: {e}")
             import traceback
             traceback.print_exc()
 
+    def prefetch_neighbours(self):
+        """Decode the previous and next images in the background unless already cached"""
+        self._prefetch_pool.clear()  # neighbours of an image we already left
+        self._prefetching.clear()
+        for i in (self.current_index + 1, self.current_index - 1):
+            if not 0 <= i < len(self.images):
+                continue
+            key = _image_cache_key(self.images[i])
+            if key is None or key in self._prefetching or QtGui.QPixmapCache.find(key) is not None:
+                continue
+            self._prefetching.add(key)
+            self._prefetch_pool.start(_PrefetchTask(self.images[i], key, self._prefetch_signals))
+
+    def _on_prefetched(self, key, image):
+        self._prefetching.discard(key)
+        if not image.isNull() and QtGui.QPixmapCache.find(key) is None:
+            QtGui.QPixmapCache.insert(key, QtGui.QPixmap.fromImage(image))
+
     def auto_save_annotations(self):
         """Automatically save annotations for current image"""
         if not self.auto_save_enabled:
@@ -1637,11 +2582,9 @@ class AnnotationTool(QtWidgets.QWidget):
 
     def save_and_overwrite(self):
         """Save all annotations and overwrite existing files with format selection"""
-        # First, auto-save any pending changes
-        for i in range(len(self.images)):
-            self.current_index = i
-            self.load_current_image()
-            self.auto_save_annotations()
+        # First, flush the canvas. Only the image on the canvas can have unsaved
+        # edits; every other image is already in self.annotations.
+        self.save_current_annotations()
         
         # Ask for save format
         format_choice = self.ask_save_format()
@@ -1650,7 +2593,6 @@ class AnnotationTool(QtWidgets.QWidget):
         
         # Show confirmation dialog
         format_name = "JSON" if format_choice == "json" else "XML"
-        self.toast(f"Overwrote {saved_count} {fmt} file(s){' with errors' if error_count else ''}.", "success" if error_count == 0 else "warning", 2200) # type: ignore
         reply = QtWidgets.QMessageBox.question(self, "Confirm Overwrite",
                                             f"This will overwrite all existing annotation files in the current folder as {format_name} format.\n\n"
                                             "Are you sure you want to continue?",
@@ -1678,13 +2620,15 @@ class AnnotationTool(QtWidgets.QWidget):
                         error_count += 1
                         
                 except Exception as e:
-                    print(f"Error saving {img_path}: {e}")
+                    log.warning("Error saving %s: %s", img_path, e)
                     error_count += 1
         
         # Clear pending saves
         self.pending_saves.clear()
         
         # Show results
+        self.toast(f"Overwrote {saved_count} {format_name} file(s){' with errors' if error_count else ''}.",
+                   "success" if error_count == 0 else "warning", 2200)
         msg = QtWidgets.QMessageBox(self)
         msg.setWindowTitle("Save Complete")
         msg.setIcon(QtWidgets.QMessageBox.Information)
@@ -1717,23 +2661,56 @@ class AnnotationTool(QtWidgets.QWidget):
             self.current_index += 1
             self.load_current_image()
             
+    def _queue_navigation(self, step):
+        """
+        Keyboard prev/next. Auto-repeat from a held A/D key can queue presses
+        faster than images load, so steps accumulate into _nav_target and only
+        the image we end up on is loaded.
+        """
+        base = self.current_index if self._nav_target is None else self._nav_target
+        target = base + step
+        if not 0 <= target < len(self.images):
+            return
+        self._nav_target = target
+        if not self._nav_timer.isActive():
+            self._nav_timer.start()
+
+    def _apply_navigation(self):
+        target, self._nav_target = self._nav_target, None
+        if target is None or target == self.current_index:
+            return
+        self.save_current_annotations()
+        self.current_index = target
+        self.load_current_image()
+            
     def change_mode(self, mode):
         mode_map = {"Rectangle": "rect", "Polygon": "polygon", "Select": "select"}
         self.canvas.set_mode(mode_map.get(mode, "rect"))
         
+    def _add_label(self, label):
+        if label not in self.existing_labels:
+            self.existing_labels.add(label)
+            self._sorted_labels_cache = None
+
+    def _sorted_labels(self):
+        """existing_labels sorted, rebuilt only after a new label was added"""
+        if self._sorted_labels_cache is None:
+            self._sorted_labels_cache = tuple(sorted(self.existing_labels))
+        return self._sorted_labels_cache
+
     def update_current_label(self, label):
         self.canvas.set_label(label)
         if label:
-            self.existing_labels.add(label)
+            self._add_label(label)
         
     def set_label(self, label):
         self.label_input.setText(label)
         self.canvas.set_label(label)
         if label:
-            self.existing_labels.add(label)
+            self._add_label(label)
         
     def show_label_selection(self):
-        dialog = LabelSelectionDialog(sorted(self.existing_labels), self)
+        dialog = LabelSelectionDialog(self._sorted_labels(), self)
         if dialog.exec_() == QtWidgets.QDialog.Accepted:
             label = dialog.get_selected_label()
             if label:
@@ -1745,7 +2722,7 @@ class AnnotationTool(QtWidgets.QWidget):
             current_label = self.canvas.shapes[self.canvas.selected_shape_index][2]
             
             # Directly open the full label selection dialog
-            dialog = LabelSelectionDialog(sorted(self.existing_labels), self)
+            dialog = LabelSelectionDialog(self._sorted_labels(), self)
             dialog.label_input.setText(current_label)  # Pre-fill with current label
             dialog.label_input.selectAll()  # Select text for easy editing
             
@@ -1753,7 +2730,7 @@ class AnnotationTool(QtWidgets.QWidget):
                 new_label = dialog.get_selected_label()
                 if new_label and new_label != current_label:
                     self.canvas.edit_selected_label(new_label)
-                    self.existing_labels.add(new_label)
+                    self._add_label(new_label)
                     # Update the label input field in main UI
                     self.label_input.setText(new_label)
         else:
@@ -1798,21 +2775,28 @@ class AnnotationTool(QtWidgets.QWidget):
     def update_thumbnail_status(self):
         for i in range(self.thumbnail_list.count()):
             item = self.thumbnail_list.item(i)
-            img_path = item.data(QtCore.Qt.UserRole)
-            
-            if img_path in self.annotations and self.annotations[img_path]:
-                item.setBackground(QtGui.QColor(76, 175, 80))
-                font = item.font()
-                font.setBold(True)
-                item.setFont(font)
-                ann_count = len(self.annotations[img_path])
-                item.setText(f"{os.path.basename(img_path)} ({ann_count})")
-            else:
-                item.setBackground(QtGui.QColor(69, 69, 88))
-                font = item.font()
-                font.setBold(False)
-                item.setFont(font)
-                item.setText(os.path.basename(img_path))
+            self._style_thumbnail_item(item, item.data(QtCore.Qt.UserRole))
+
+    def _refresh_thumbnail_item(self, img_path):
+        """Restyle only the thumbnail of img_path after its annotations changed"""
+        item = self.thumbnail_list.item_for(img_path)
+        if item is not None:
+            self._style_thumbnail_item(item, img_path)
+
+    def _style_thumbnail_item(self, item, img_path):
+        if img_path in self.annotations and self.annotations[img_path]:
+            item.setBackground(QtGui.QColor(76, 175, 80))
+            font = item.font()
+            font.setBold(True)
+            item.setFont(font)
+            ann_count = len(self.annotations[img_path])
+            item.setText(f"{os.path.basename(img_path)} ({ann_count})")
+        else:
+            item.setBackground(QtGui.QColor(69, 69, 88))
+            font = item.font()
+            font.setBold(False)
+            item.setFont(font)
+            item.setText(os.path.basename(img_path))
         
     def save_current_annotations(self):
         if 0 <= self.current_index < len(self.images):
@@ -1821,7 +2805,7 @@ class AnnotationTool(QtWidgets.QWidget):
                 self.annotations[self.images[self.current_index]] = annotations
                 self.pending_saves.add(self.images[self.current_index])
                 self.update_annotated_count()
-                self.update_thumbnail_status()
+                self._refresh_thumbnail_item(self.images[self.current_index])
                 
     def save_current(self):
         """Save current annotations with format selection"""
@@ -1854,13 +2838,23 @@ class AnnotationTool(QtWidgets.QWidget):
                 self.toast("Current annotations saved to new folder.", "success", 1600)
         
     def save_all(self):
-        for i in range(len(self.images)):
-            self.current_index = i
-            self.load_current_image()
-            self.auto_save_annotations()
-        
+        # Only the image on the canvas can have edits not yet in self.annotations
+        self.save_current_annotations()
         self.enable_final_verification_mode()
 
+    def thumbnail_pixmap(self, img_path, size):
+        """Small preview of img_path, decoded at size and kept until the file changes"""
+        try:
+            mtime = os.stat(img_path).st_mtime_ns
+        except OSError:
+            return QtGui.QPixmap()
+        key = (img_path, mtime, size.width(), size.height())
+        pixmap = self._thumb_cache.get(key)
+        if pixmap is None:
+            pixmap = QtGui.QPixmap.fromImage(_read_thumbnail(img_path, size))
+            self._thumb_cache[key] = pixmap
+        return pixmap
+
     def enable_final_verification_mode(self):
         self.final_save_mode = True
         self.auto_save_enabled = False
@@ -1868,39 +2862,18 @@ class AnnotationTool(QtWidgets.QWidget):
         dialog = QtWidgets.QDialog(self)
         dialog.setWindowTitle("Final Verification - Review All Annotations")
         dialog.setMinimumSize(700, 500)
-        dialog.setStyleSheet("""
-            QDialog {
-                background-color: #2D2D3C;
-                color: white;
-            }
-            QPushButton {
-                background-color: #4A90E2;
-                color: white;
-                border: none;
-                padding: 8px;
-                border-radius: 4px;
-                margin: 5px;
-            }
-            QPushButton:hover {
-                background-color: #5BA0F0;
-            }
-            QListWidget {
-                background-color: #454558;
-                color: white;
-                border: 1px solid #555;
-            }
-        """)
+        dialog.setStyleSheet(self._REVIEW_DIALOG_STYLE)
         
         layout = QtWidgets.QVBoxLayout(dialog)
         
         title = QtWidgets.QLabel("📋 Final Annotation Review")
-        title.setStyleSheet("font-size: 16px; font-weight: bold; color: #4A90E2; margin: 10px;")
+        title.setStyleSheet(self._REVIEW_TITLE_STYLE)
         layout.addWidget(title)
         
         annotated_count = sum(1 for img_path in self.images 
                              if img_path in self.annotations and self.annotations[img_path])
         summary = QtWidgets.QLabel(f"📊 Annotated Images: {annotated_count}/{len(self.images)}")
-        summary.setStyleSheet("margin: 10px; font-weight: bold;")
+        summary.setStyleSheet(self._REVIEW_SUMMARY_STYLE)
         layout.addWidget(summary)
         
         list_widget = QtWidgets.QListWidget()
@@ -1909,10 +2882,13 @@ class AnnotationTool(QtWidgets.QWidget):
         for img_path in self.images:
             item = QtWidgets.QListWidgetItem(os.path.basename(img_path))
             
-            pixmap = QtGui.QPixmap(img_path)
-            if not pixmap.isNull():
-                scaled_pixmap = pixmap.scaled(50, 50, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-                item.setIcon(QtGui.QIcon(scaled_pixmap))
+            # Only annotated images are worth a preview; the rest share one placeholder
+            if img_path in self.annotations and self.annotations[img_path]:
+                scaled_pixmap = self.thumbnail_pixmap(img_path, QtCore.QSize(50, 50))
+                if not scaled_pixmap.isNull():
+                    item.setIcon(QtGui.QIcon(scaled_pixmap))
+            else:
+                item.setIcon(_no_annotations_icon())
             
             if img_path in self.annotations and self.annotations[img_path]:
                 ann_count = len(self.annotations[img_path])
@@ -1958,6 +2934,27 @@ class AnnotationTool(QtWidgets.QWidget):
         self.auto_save_enabled = True
         dialog.accept()
 
+    def _export_one(self, img_path, format_choice, output_folder):
+        """Write one image's annotation file plus a copy of the image; True on success (pool worker)"""
+        try:
+            if format_choice == "json":
+                success = self.save_annotations_as_json(img_path, output_folder,
+                                                        overwrite=False, copy_image=False)
+            else:  # xml
+                success = self.save_annotations_as_xml(img_path, output_folder, overwrite=False)
+        except Exception as e:
+            log.warning("Error saving %s: %s", img_path, e)
+            return False
+        if not success:
+            return False
+        try:
+            # Copy original image next to its annotation
+            self.save_original_image(img_path, output_folder)
+        except Exception as ce:
+            # copying the image shouldn't block counting the annotation as saved
+            log.warning("Could not copy image for %s: %s", img_path, ce)
+        return True
+
     def final_save_all_annotations(self, dialog):
         format_choice = self.ask_save_format()
         if format_choice is None:
@@ -1995,31 +2992,19 @@ class AnnotationTool(QtWidgets.QWidget):
 
         images = getattr(self, "images", []) or []
         ann = getattr(self, "annotations", {}) or {}
-
-        for img_path in images:
-            try:
-                if img_path in ann and ann[img_path]:
-                    if format_choice == "json":
-                        success = self.save_annotations_as_json(img_path, main_annot_folder, overwrite=False)
-                    else:  # xml
-                        success = self.save_annotations_as_xml(img_path, main_annot_folder, overwrite=False)
-
-                    if success:
-                        # Copy original image next to its annotation
-                        base_name = os.path.splitext(os.path.basename(img_path))[0]
-                        original_extension = os.path.splitext(img_path)[1].lower()
-                        image_copy_path = os.path.join(main_annot_folder, f"{base_name}{original_extension}")
-                        try:
-                            shutil.copy2(img_path, image_copy_path)
-                        except Exception as ce:
-                            # copying the image shouldn't block counting the annotation as saved
-                            print(f"[WARN] Could not copy image for {img_path}: {ce}")
-                        saved_count += 1
-                    else:
-                        error_count += 1
-            except Exception as e:
-                print(f"[ERR] Error saving {img_path}: {e}")
-                error_count += 1
+        # Work from a snapshot so the pool sees one consistent set of images
+        todo = [img_path for img_path in images if img_path in ann and ann[img_path]]
+
+        # Every image is independent (serialize, write, copy the original), so
+        # the whole export runs in a pool; results are only counted here.
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 4)) as pool:
+            futures = [pool.submit(self._export_one, img_path, format_choice, main_annot_folder)
+                       for img_path in todo]
+            for future in as_completed(futures):
+                if future.result():
+                    saved_count += 1
+                else:
+                    error_count += 1
 
         # Clear pending saves if you track them
         try:
@@ -2097,7 +3082,7 @@ class AnnotationTool(QtWidgets.QWidget):
             print(f"Unknown format: {format_choice}")
             return False
 
-    def save_annotations_as_json(self, img_path, output_folder, overwrite=False):
+    def save_annotations_as_json(self, img_path, output_folder, overwrite=False, copy_image=True):
         """Save annotations as JSON file in LabelMe format"""
         if img_path not in self.annotations or not self.annotations[img_path]:
             return False
@@ -2111,24 +3096,25 @@ class AnnotationTool(QtWidgets.QWidget):
                 json_path = os.path.join(output_folder, f"{base_name}.json")
             
             image_name = os.path.basename(img_path)
-            
-            # Get image data as base64
-            image_data = ""
-            try:
-                with open(img_path, 'rb') as img_file:
-                    image_bytes = img_file.read()
-                    image_data = base64.b64encode(image_bytes).decode('utf-8')
-            except Exception as e:
-                print(f"Error encoding image data: {e}")
+            image_size = self.image_size(img_path)
+            if image_size is None:
+                log.warning("Error saving JSON for %s: could not read image size", img_path)
+                return False
+            
+            # Get image data as base64 (only when embedding is enabled)
+            image_data = None
+            if self.embed_image_data:
+                try:
+                    image_data = encode_image_data(img_path)
+                except Exception as e:
+                    image_data = ""
+                    log.warning("Error encoding image data for %s: %s", img_path, e)
             
             # Convert to LabelMe format
             shapes = []
             for ann in self.annotations[img_path]:
-                # Convert points to floats
-                float_points = []
-                for point in ann['points']:
-                    if isinstance(point, (list, tuple)) and len(point) >= 2:
-                        float_points.append([float(point[0]), float(point[1])])
+                # Float point array; serialized as-is by dump_annotation_json
+                float_points = annotation_points(ann['points'])
                 
                 shape = {
                     "label": ann['label'],
@@ -2147,8 +3133,8 @@ class AnnotationTool(QtWidgets.QWidget):
                 "shapes": shapes,
                 "imagePath": image_name,
                 "imageData": image_data,
-                "imageHeight": self.canvas.original_pixmap.height(),
-                "imageWidth": self.canvas.original_pixmap.width()
+                "imageHeight": image_size[1],
+                "imageWidth": image_size[0]
             }
             
             # Add custom fields for tracking
@@ -2158,24 +3144,24 @@ class AnnotationTool(QtWidgets.QWidget):
                 annotation_data['updated_time'] = QtCore.QDateTime.currentDateTime().toString("yyyy-MM-dd HH:mm:ss")
                 annotation_data['updated'] = True
             
-            with open(json_path, 'w') as f:
-                json.dump(annotation_data, f, indent=2)
+            # Serialize in one go and hand the file a single buffer
+            write_file_bytes(json_path, dump_annotation_json(annotation_data))
             
             # Save original image (only for new folders, not for overwrites)
-            if not overwrite:
+            if not overwrite and copy_image:
                 self.save_original_image(img_path, output_folder)
             
             return True
             
         except Exception as e:
-            print(f"Error saving JSON for {img_path}: {e}")
+            log.warning("Error saving JSON for %s: %s", img_path, e)
             return False
 
     def save_original_image(self, img_path, output_folder):
         base_name = os.path.splitext(os.path.basename(img_path))[0]
         original_extension = os.path.splitext(img_path)[1].lower()
         output_path = os.path.join(output_folder, f"{base_name}{original_extension}")
-        shutil.copy2(img_path, output_path)
+        fast_copy(img_path, output_path)
         
     def load_annotations(self):
         """Load annotations for current image and display them on canvas - FIXED"""
@@ -2189,38 +3175,32 @@ class AnnotationTool(QtWidgets.QWidget):
             
             # Clear current shapes and load new ones
             self.canvas.shapes.clear()
+            self.canvas.shapes_changed()
             
+            shape_loaders = self._shape_loaders
             for i, ann in enumerate(annotations):
                 try:
-                    
-                    if ann['shape'] == 'rectangle':
-                        points = ann['points']
-                        
-                        if len(points) >= 2:
-                            # Convert points to QPoints
-                            point1 = QtCore.QPoint(int(points[0][0]), int(points[0][1]))
-                            point2 = QtCore.QPoint(int(points[1][0]), int(points[1][1]))
-                            
-                            # Add to canvas shapes
-                            self.canvas.shapes.append(('rect', [point1, point2], ann['label']))
-                            
-                    elif ann['shape'] == 'polygon':
-                        qpoints = []
-                        for point in ann['points']:
-                            if len(point) >= 2:
-                                qpoints.append(QtCore.QPoint(int(point[0]), int(point[1])))
-                        
-                        
-                        if len(qpoints) >= 3:
-                            # Add to canvas shapes
-                            self.canvas.shapes.append(('polygon', qpoints, ann['label']))
-                            
+                    loader = shape_loaders.get(ann['shape'])
+                    if loader is not None:
+                        loader(ann)
                 except Exception as e:
                     print(f"load_annotations: Error in annotation {i}: {e}")
                     continue
         else:
-            self.canvas.update()
+            self.canvas.image_label.update()
             
+    def _load_rect(self, ann):
+        # One array cast for all points (loaded JSONs already hold arrays)
+        points = annotation_points(ann['points'])
+        if len(points) >= 2:
+            # Add to canvas shapes as a (2, 2) int32 point array
+            self.canvas.shapes.append(('rect', _points_array(points[:2]), ann['label']))
+
+    def _load_poly(self, ann):
+        points = annotation_points(ann['points'])
+        if len(points) >= 3:
+            self.canvas.shapes.append(('polygon', _points_array(points), ann['label']))
+
     def update_annotated_count(self):
         annotated = sum(1 for img_path in self.images 
                        if img_path in self.annotations and self.annotations[img_path])
@@ -2231,72 +3211,27 @@ class AnnotationTool(QtWidgets.QWidget):
         self.annotated_count_label.setText(status)
 
     def apply_dark_theme(self):
-        self.setStyleSheet("""
-            QMainWindow, QWidget {
-                background-color: #2D2D3C;
-                color: white;
-            }
-            QGroupBox {
-                color: white;
-                border: 2px solid #444;
-                border-radius: 5px;
-                margin-top: 1ex;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-            }
-            QPushButton {
-                background-color: #2d7ef1;
-                color: white;
-                border: none;
-                padding: 6px;
-                border-radius: 4px;
-                font-size: 11px;
-            }
-            QPushButton:hover {
-                background-color: #5BA0F0;
-            }
-            QPushButton:pressed {
-                background-color: #3A80D2;
-            }
-            QLineEdit, QComboBox {
-                background-color: #454558;
-                color: white;
-                border: 1px solid #555;
-                padding: 4px;
-                border-radius: 3px;
-                font-size: 11px;
-            }
-            QListWidget {
-                background-color: #454558;
-                color: white;
-                border: 1px solid #555;
-            }
-            QScrollArea {
-                border: 1px solid #555;
-            }
-        """)
+        self.setStyleSheet(self._DARK_THEME_STYLE)
         
     def setup_shortcuts(self):
-        # Navigation shortcuts
-        QtWidgets.QShortcut(QtGui.QKeySequence("A"), self, self.prev_image)
-        QtWidgets.QShortcut(QtGui.QKeySequence("D"), self, self.next_image)
-        QtWidgets.QShortcut(QtGui.QKeySequence("Left"), self, self.prev_image)
-        QtWidgets.QShortcut(QtGui.QKeySequence("Right"), self, self.next_image)
-        
-        # Tool shortcuts
-        QtWidgets.QShortcut(QtGui.QKeySequence("R"), self, lambda: self.mode_combo.setCurrentText("Rectangle"))
-        QtWidgets.QShortcut(QtGui.QKeySequence("P"), self, lambda: self.mode_combo.setCurrentText("Polygon"))
-        QtWidgets.QShortcut(QtGui.QKeySequence("S"), self, lambda: self.mode_combo.setCurrentText("Select"))
-        
-        # ADD LABEL EDIT SHORTCUT
-        QtWidgets.QShortcut(QtGui.QKeySequence("E"), self, self.edit_selected_label)
-        QtWidgets.QShortcut(QtGui.QKeySequence("Delete"), self, self.delete_selected)
-        QtWidgets.QShortcut(QtGui.QKeySequence("Ctrl+D"), self, self.delete_selected)
-        QtWidgets.QShortcut(QtGui.QKeySequence("F5"), self, self.refresh_current_annotations)
+        shortcuts = [
+            # Navigation shortcuts
+            ("A", partial(self._queue_navigation, -1)),
+            ("D", partial(self._queue_navigation, 1)),
+            ("Left", partial(self._queue_navigation, -1)),
+            ("Right", partial(self._queue_navigation, 1)),
+            # Tool shortcuts
+            ("R", partial(self.mode_combo.setCurrentText, "Rectangle")),
+            ("P", partial(self.mode_combo.setCurrentText, "Polygon")),
+            ("S", partial(self.mode_combo.setCurrentText, "Select")),
+            # ADD LABEL EDIT SHORTCUT
+            ("E", self.edit_selected_label),
+            ("Delete", self.delete_selected),
+            ("Ctrl+D", self.delete_selected),
+            ("F5", self.refresh_current_annotations),
+        ]
+        for key, slot in shortcuts:
+            QtWidgets.QShortcut(QtGui.QKeySequence(key), self, slot)
 
     def refresh_current_annotations(self):
         """Force refresh of current image annotations"""
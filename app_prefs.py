@@ -1,10 +1,12 @@
 # app_prefs.py
 from __future__ import annotations
 import json, os, tempfile, base64
+from functools import lru_cache
 from typing import Any, Dict
-from PyQt5.QtCore import QStandardPaths, QByteArray
+from PyQt5.QtCore import QStandardPaths, QByteArray, QTimer, QCoreApplication
 
 APP_DIR_NAME = "AI-Model-Training-Suite"
+SAVE_DELAY_MS = 250  # setters write at most this often (see AppPrefs._schedule_save)
 
 # ---- defaults ----
 DEFAULT_PREFS: Dict[str, Any] = {
@@ -13,9 +15,13 @@ DEFAULT_PREFS: Dict[str, Any] = {
     "window_geometry_b64": "",
     "window_state_b64": "",
     "theme": "Dark",          # <— NEW: persisted theme
+    "embed_image_data": False,  # annotation JSONs: base64 image copy in imageData
 }
 
+@lru_cache(maxsize=1)
 def _app_data_dir() -> str:
+    # Resolved (and created) on first use, not at import: AppDataLocation
+    # depends on the application name set at startup
     base = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
     if not base:
         base = os.path.expanduser("~/.config")
@@ -23,6 +29,7 @@ def _app_data_dir() -> str:
     os.makedirs(path, exist_ok=True)
     return path
 
+@lru_cache(maxsize=1)
 def _prefs_path() -> str:
     return os.path.join(_app_data_dir(), "session.json")
 
@@ -34,12 +41,17 @@ def _atomic_write(path: str, data: str) -> None:
         with os.fdopen(fd, "w", encoding="utf-8") as f:
             f.write(data)
         os.replace(tmp, path)
-    finally:
+    except BaseException:
+        # after a successful replace there is nothing left to clean up
         try:
-            if os.path.exists(tmp):
-                os.remove(tmp)
-        except Exception:
+            os.unlink(tmp)
+        except FileNotFoundError:
             pass
+        raise
+
+def _serialize(data: Dict[str, Any]) -> str:
+    # compact and key-sorted, so equal prefs always produce the same text
+    return json.dumps(data, sort_keys=True, separators=(",", ":"))
 
 class AppPrefs:
     """Tiny JSON-backed preference store with typed helpers."""
@@ -47,6 +59,12 @@ class AppPrefs:
         self._path = _prefs_path()
         # start with defaults, then merge on load
         self._data: Dict[str, Any] = DEFAULT_PREFS.copy()
+        self._dirty = False
+        self._save_timer = None  # created on first use, needs a running Qt app
+        self._last_serialized = None  # what session.json holds, if known
+        # raw bytes behind the stored geometry/state, to skip re-encoding repeats
+        self._geom_bytes = None
+        self._state_bytes = None
         self.load()
 
     # ---------- core load/save ----------
@@ -58,6 +76,7 @@ class AppPrefs:
                 # merge: keep defaults for any missing keys
                 for k, v in DEFAULT_PREFS.items():
                     self._data[k] = on_disk.get(k, v)
+                self._last_serialized = _serialize(self._data)
             else:
                 # ensure file created on first save
                 self._data = DEFAULT_PREFS.copy()
@@ -66,18 +85,47 @@ class AppPrefs:
             self._data = DEFAULT_PREFS.copy()
 
     def save(self) -> None:
+        """Write now (compact JSON); cancels any pending delayed save."""
+        if self._save_timer is not None:
+            self._save_timer.stop()
+        self._dirty = False
+        blob = _serialize(self._data)
+        if blob == self._last_serialized:
+            return  # e.g. the window "moved" back to the same geometry
         try:
-            _atomic_write(self._path, json.dumps(self._data, indent=2))
+            _atomic_write(self._path, blob)
+            self._last_serialized = blob
         except Exception:
             pass
 
+    def flush(self) -> None:
+        """Write pending changes, if any (call on shutdown)."""
+        if self._dirty:
+            self.save()
+
+    def _schedule_save(self) -> None:
+        # Geometry/state setters can fire many times a second while the window
+        # moves; coalesce them into at most one write per SAVE_DELAY_MS.
+        self._dirty = True
+        if QCoreApplication.instance() is None:
+            self.save()
+            return
+        if self._save_timer is None:
+            self._save_timer = QTimer()
+            self._save_timer.setSingleShot(True)
+            self._save_timer.setInterval(SAVE_DELAY_MS)
+            self._save_timer.timeout.connect(self.flush)
+            QCoreApplication.instance().aboutToQuit.connect(self.flush)
+        if not self._save_timer.isActive():
+            self._save_timer.start()
+
     # ---------- generic get/set ----------
     def get(self, key: str, default: Any=None) -> Any:
         return self._data.get(key, default)
 
     def set(self, key: str, value: Any) -> None:
         self._data[key] = value
-        self.save()
+        self._schedule_save()
 
     # ---------- convenience: theme ----------
     @property
@@ -87,7 +135,7 @@ class AppPrefs:
     @theme.setter
     def theme(self, val: str):
         self._data["theme"] = str(val or DEFAULT_PREFS["theme"])
-        self.save()
+        self._schedule_save()
 
     # Optional explicit getters/setters if you prefer call-style
     def get_theme(self, default: str = DEFAULT_PREFS["theme"]) -> str:
@@ -99,8 +147,12 @@ class AppPrefs:
     # ---------- window geometry/state (QByteArray <-> base64) ----------
     def set_geometry(self, ba: QByteArray) -> None:
         if isinstance(ba, QByteArray):
-            self._data["window_geometry_b64"] = base64.b64encode(bytes(ba)).decode("ascii")
-            self.save()
+            b = bytes(ba)
+            if b == self._geom_bytes:
+                return
+            self._geom_bytes = b
+            self._data["window_geometry_b64"] = base64.b64encode(b).decode("ascii")
+            self._schedule_save()
 
     def get_geometry(self) -> QByteArray:
         b64 = self._data.get("window_geometry_b64")
@@ -113,8 +165,12 @@ class AppPrefs:
 
     def set_win_state(self, ba: QByteArray) -> None:
         if isinstance(ba, QByteArray):
-            self._data["window_state_b64"] = base64.b64encode(bytes(ba)).decode("ascii")
-            self.save()
+            b = bytes(ba)
+            if b == self._state_bytes:
+                return
+            self._state_bytes = b
+            self._data["window_state_b64"] = base64.b64encode(b).decode("ascii")
+            self._schedule_save()
 
     def get_win_state(self) -> QByteArray:
         b64 = self._data.get("window_state_b64")
@@ -128,7 +184,7 @@ class AppPrefs:
     # ---------- last tool index ----------
     def set_last_tool_index(self, idx: int) -> None:
         self._data["last_tool_index"] = int(idx)
-        self.save()
+        self._schedule_save()
 
     def get_last_tool_index(self, default: int=0) -> int:
         try:
@@ -139,7 +195,7 @@ class AppPrefs:
     # ---------- maximized flag ----------
     def set_maximized(self, maximized: bool) -> None:
         self._data["maximized"] = bool(maximized)
-        self.save()
+        self._schedule_save()
 
     def get_maximized(self, default: bool=False) -> bool:
         v = self._data.get("maximized", default)
@@ -160,3 +216,11 @@ class AppPrefs:
     def get_sidebar_collapsed(self, default: bool = False) -> bool:
         v = self._data.get("sidebar_collapsed", default)
         return bool(v)
+
+    # ---------- annotation export ----------
+    def set_embed_image_data(self, embed: bool) -> None:
+        self._data["embed_image_data"] = bool(embed)
+        self._schedule_save()
+
+    def get_embed_image_data(self, default: bool = DEFAULT_PREFS["embed_image_data"]) -> bool:
+        return bool(self._data.get("embed_image_data", default))